@@ -0,0 +1,54 @@
+import argparse
+import os
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+
+from common import best_of, generate_maze_pixels, write_maze_png
+
+os.environ["MAZE_LEVEL_CACHE"] = tempfile.mkdtemp(prefix="maze-bench-cache-")
+
+from map import Map
+
+
+def scalar_hits(game_map, ball):
+
+    # the per-thorn check the kernel replaces, in the kernel's index order
+    return np.flatnonzero([thorn.check_collision(ball) for thorn in game_map.thorns])
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Per-thorn checks against the packed thorn kernel.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[129, 257, 513])
+    parser.add_argument("--hazard-density", type=float, default=0.01)
+    parser.add_argument("--balls", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    directory = tempfile.mkdtemp(prefix="maze-bench-")
+    print(f"{'size':>6} {'thorns':>8} {'scalar ms':>10} {'one ball ms':>12} {'batch ms':>9} {'speedup':>8}")
+    for size in args.sizes:
+        path = write_maze_png(generate_maze_pixels(size, args.seed, args.hazard_density, 7), directory)
+        game_map = Map(str(path), difficulty="hard")
+        thorns = game_map.thorn_arrays
+        positions = rng.uniform(0, size * game_map.scale, size=(args.balls, 2))
+        balls = [SimpleNamespace(position=position, radius=150) for position in positions]
+
+        scalar_time, expected = best_of(lambda: [scalar_hits(game_map, ball) for ball in balls], 3)
+        single_time, single = best_of(lambda: [thorns.hits(ball.position, ball.radius) for ball in balls], 3)
+        batch_time, (ball_indices, thorn_indices) = best_of(lambda: thorns.hits(positions, 150), 3)
+
+        for index, hits in enumerate(expected):
+            assert np.array_equal(hits, single[index])
+            assert np.array_equal(hits, thorn_indices[ball_indices == index])
+
+        count = len(thorns.thorns)
+        print(f"{size:>6} {count:>8} {scalar_time * 1e3:>10.2f} {single_time * 1e3:>12.2f} "
+              f"{batch_time * 1e3:>9.2f} {scalar_time / batch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import time
+
+import numpy as np
+import pygame
+
+from common import SHIPPED_MAZES
+
+from level import Level
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Frame time of gravity mode while the map keeps rotating.")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--height", type=int, default=1000)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((args.width, args.height))
+
+    print(f"{'maze':<10} {'update ms':>10} {'draw p50 ms':>12} {'draw p99 ms':>12}")
+    for maze in SHIPPED_MAZES:
+        level = Level(int(maze[4:-4]), "hard", "gravity")
+        level.start_level(maze)
+        level.controller.rotation_direction = 'left'
+
+        update_times = []
+        draw_times = []
+        for _ in range(args.frames):
+            start = time.perf_counter()
+            level.update()
+            update_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            screen.fill((255, 255, 255))
+            level.draw(screen)
+            draw_times.append(time.perf_counter() - start)
+
+        print(f"{maze:<10} {np.mean(update_times) * 1e3:>10.3f} "
+              f"{np.percentile(draw_times, 50) * 1e3:>12.3f} {np.percentile(draw_times, 99) * 1e3:>12.3f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
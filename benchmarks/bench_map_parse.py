@@ -0,0 +1,97 @@
+import argparse
+
+from common import SHIPPED_MAZES, best_of, generate_maze_pixels, write_maze_png
+
+from guard import Guard
+from map import Map
+from thorn import Thorn
+from trap import Trap
+
+
+class LegacyMap(Map):
+
+    # the original per-pixel parser, kept here as the reference for parity and timing
+    def parse_map(self):
+
+        height, width, _ = self.image_array.shape
+
+        for y in range(height):
+            for x in range(width):
+                pixel = self.image_array[y, x]
+
+                if (pixel == [0, 0, 0]).all():
+                    self.walls.append((x * self.scale, y * self.scale,
+                                       self.scale, self.scale))
+
+                elif (pixel == [0, 255, 0]).all():
+                    self.start_position = (x * self.scale + self.scale // 2,
+                                           y * self.scale + self.scale // 2)
+
+                elif (pixel == [255, 0, 0]).all():
+                    trap_pos = (x * self.scale + self.scale // 2,
+                                y * self.scale + self.scale // 2)
+                    self.traps.append(Trap(trap_pos, self.obstacle_radius))
+
+                elif (pixel == [255, 0, 255]).all():
+                    if self.difficulty == "hard":
+                        thorn_pos = (x * self.scale + self.scale // 2,
+                                     y * self.scale + self.scale // 2)
+                        self.thorns.append(Thorn(thorn_pos, size=300))
+
+                elif (pixel == [255, 255, 0]).all():
+                    if self.difficulty == "hard":
+                        guard_pos = (x * self.scale + self.scale // 2,
+                                     y * self.scale + self.scale // 2)
+                        self.guards.append(Guard(guard_pos))
+
+                elif (pixel == [0, 0, 255]).all():
+                    self.end_position = (x * self.scale + self.scale // 2,
+                                         y * self.scale + self.scale // 2)
+                    self.end_radius = self.obstacle_radius
+
+
+def map_signature(game_map):
+
+    return (
+        game_map.walls,
+        game_map.start_position,
+        game_map.end_position,
+        [tuple(t.position.tolist()) for t in game_map.traps],
+        [tuple(t.position.tolist()) for t in game_map.thorns],
+        [tuple(g.position.tolist()) for g in game_map.guards],
+    )
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Compare per-pixel and vectorized map parsing.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[65, 256, 1024])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for maze in SHIPPED_MAZES:
+        for difficulty in ("easy", "hard"):
+            fresh = map_signature(Map(maze, difficulty=difficulty, use_cache=False))
+            if map_signature(LegacyMap(maze, difficulty=difficulty, use_cache=False)) != fresh:
+                raise SystemExit(f"parser output differs for {maze} ({difficulty})")
+            Map(maze, difficulty=difficulty)
+            if map_signature(Map(maze, difficulty=difficulty)) != fresh:
+                raise SystemExit(f"cached load differs for {maze} ({difficulty})")
+    print(f"parity ok on {len(SHIPPED_MAZES)} shipped mazes")
+
+    print(f"{'size':>10} {'legacy (s)':>12} {'vectorized (s)':>15} {'cached (s)':>11} {'speedup':>9}")
+    for size in args.sizes:
+        path = write_maze_png(generate_maze_pixels(size))
+        legacy_time, legacy = best_of(lambda: LegacyMap(str(path), use_cache=False), args.repeat)
+        fast_time, fast = best_of(lambda: Map(str(path), use_cache=False), args.repeat)
+        Map(str(path))
+        cached_time, cached = best_of(lambda: Map(str(path)), args.repeat)
+        if not map_signature(legacy) == map_signature(fast) == map_signature(cached):
+            raise SystemExit(f"parser output differs for {size}x{size}")
+        label = f"{fast.raw_width}x{fast.raw_height}"
+        print(f"{label:>10} {legacy_time:>12.4f} {fast_time:>15.4f} {cached_time:>11.4f} "
+              f"{legacy_time / cached_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import itertools
+import time
+from queue import PriorityQueue
+
+import numpy as np
+
+from common import SHIPPED_MAZES
+
+from map import Map
+from pathfinding import GridPathfinder
+
+
+def legacy_search(grid, start, end):
+
+    # the PriorityQueue + dict A* the guards used before the pathfinding module
+    width, height = len(grid), len(grid[0])
+    open_set = PriorityQueue()
+    open_set.put((0, start))
+    came_from = {}
+    g_score = {start: 0}
+
+    while not open_set.empty():
+        current = open_set.get()[1]
+
+        if current == end:
+            path = []
+            while current in came_from:
+                path.insert(0, current)
+                current = came_from[current]
+            return tuple(path)
+
+        for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+            neighbor = (current[0] + dx, current[1] + dy)
+            if not (0 <= neighbor[0] < width and 0 <= neighbor[1] < height):
+                continue
+            if grid[neighbor[0]][neighbor[1]] == 1:
+                continue
+            tentative_g_score = g_score[current] + 1
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                f_score = tentative_g_score + abs(neighbor[0] - end[0]) + abs(neighbor[1] - end[1])
+                open_set.put((f_score, neighbor))
+
+    return None
+
+
+def corner_cells(grid):
+
+    # the free cell closest to each corner of the grid
+    width, height = grid.shape
+    free = np.argwhere(grid == 0)
+    corners = []
+    for corner in ((0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1)):
+        nearest = free[np.abs(free - corner).sum(axis=1).argmin()]
+        corners.append((int(nearest[0]), int(nearest[1])))
+    return corners
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Corner-to-corner A* on every shipped maze.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'maze':<10} {'searches':>8} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}")
+    for maze in SHIPPED_MAZES:
+        grid = Map(maze).occupancy_grid
+        grid_lists = grid.tolist()
+        pathfinder = GridPathfinder(grid)
+        pairs = list(itertools.permutations(corner_cells(grid), 2))
+
+        for start, end in pairs:
+            if legacy_search(grid_lists, start, end) != pathfinder.search(start, end):
+                raise SystemExit(f"path mismatch on {maze} from {start} to {end}")
+
+        began = time.perf_counter()
+        for _ in range(args.repeat):
+            for start, end in pairs:
+                legacy_search(grid_lists, start, end)
+        legacy = (time.perf_counter() - began) / (args.repeat * len(pairs))
+
+        began = time.perf_counter()
+        for _ in range(args.repeat):
+            for start, end in pairs:
+                pathfinder.search(start, end)
+        engine = (time.perf_counter() - began) / (args.repeat * len(pairs))
+
+        print(f"{maze:<10} {len(pairs):>8} {legacy * 1e3:>10.3f} {engine * 1e3:>10.3f} {legacy / engine:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import time
+
+import numpy as np
+
+from common import SHIPPED_MAZES
+
+from vector_env import MazeVectorEnv
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Environment steps per second of MazeVectorEnv on the shipped mazes.")
+    parser.add_argument("--envs", type=int, default=12)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    levels = [int(maze[4:-4]) for maze in SHIPPED_MAZES]
+    rng = np.random.default_rng(args.seed)
+    print(f"{'difficulty':<11} {'mode':<12} {'env steps/s':>12}")
+    for difficulty in ("easy", "hard"):
+        for mode in ("non-gravity", "gravity"):
+            env = MazeVectorEnv(levels, difficulty, mode, num_envs=args.envs, seed=args.seed)
+            env.reset()
+            actions = rng.integers(0, 16, size=(args.steps, args.envs))
+            start = time.perf_counter()
+            for step_actions in actions:
+                env.step(step_actions)
+            elapsed = time.perf_counter() - start
+            print(f"{difficulty:<11} {mode:<12} {args.steps * args.envs / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
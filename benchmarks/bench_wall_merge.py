@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+
+from common import SHIPPED_MAZES
+
+from map import Map
+from physics import PhysicsWorld
+
+
+def build_world(game_map, merged):
+
+    world = PhysicsWorld(gravity=(0, 9.8), pixels_per_meter=100)
+    ball = world.create_ball(position=game_map.get_start_position(), radius=150,
+                             density=1.0, friction=0.1, restitution=0.3)
+    if merged:
+        world.create_static_boxes(game_map.wall_rects)
+    else:
+        for x, y, w, h in game_map.walls:
+            world.create_static_box(position=(x + w / 2, y + h / 2), size=(w, h))
+    for trap in game_map.traps:
+        world.create_static_circle(position=trap.position, radius=trap.radius)
+    if game_map.end_position:
+        world.create_static_circle(position=game_map.end_position, radius=game_map.end_radius)
+    return world, ball
+
+
+def run(game_map, merged, steps):
+
+    world, ball = build_world(game_map, merged)
+    fixtures = sum(len(body.fixtures) for body in world.world.bodies)
+
+    # roll the ball around by slowly spinning gravity so it keeps touching walls
+    start = time.perf_counter()
+    for i in range(steps):
+        angle = i * world.time_step * 0.5
+        world.set_gravity((9.8 * np.sin(angle), 9.8 * np.cos(angle)))
+        world.step()
+    per_step = (time.perf_counter() - start) / steps
+    return world.world.bodyCount, fixtures, per_step, world.get_body_position(ball)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Compare per-pixel wall bodies with merged wall rectangles.")
+    parser.add_argument("--steps", type=int, default=1200)
+    args = parser.parse_args()
+
+    print(f"{'maze':<10} {'bodies':>13} {'fixtures':>13} {'step us':>15} {'ball drift px':>14}")
+    for maze in SHIPPED_MAZES:
+        game_map = Map(maze)
+        old_bodies, old_fixtures, old_step, old_pos = run(game_map, False, args.steps)
+        new_bodies, new_fixtures, new_step, new_pos = run(game_map, True, args.steps)
+        drift = float(np.linalg.norm(np.subtract(old_pos, new_pos)))
+        print(f"{maze:<10} {old_bodies:>6} -> {new_bodies:<4} {old_fixtures:>6} -> {new_fixtures:<4} "
+              f"{old_step * 1e6:>6.1f} -> {new_step * 1e6:<6.1f} {drift:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
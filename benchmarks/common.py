@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (str(ROOT), str(ROOT / "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from map import START_COLOR, END_COLOR, TRAP_COLOR, THORN_COLOR, GUARD_COLOR
+
+SHIPPED_MAZES = sorted(p.name for p in (ROOT / "assets" / "images").glob("maze*.png"))
+
+
+def generate_maze_pixels(size, seed=0, hazard_density=0.01, corridor=1):
+
+    # carve a perfect maze of corridor-wide cells and one-pixel walls with an
+    # iterative backtracker; the shipped mazes use corridor=7
+    rng = np.random.default_rng(seed)
+    pixels = np.zeros((size, size, 3), dtype=np.uint8)
+    pitch = corridor + 1
+    cells = (size - 1) // pitch
+    visited = np.zeros((cells, cells), dtype=bool)
+    stack = [(0, 0)]
+    visited[0, 0] = True
+    pixels[1:1 + corridor, 1:1 + corridor] = 255
+
+    while stack:
+        cx, cy = stack[-1]
+        neighbours = [(cx + dx, cy + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                      if 0 <= cx + dx < cells and 0 <= cy + dy < cells
+                      and not visited[cy + dy, cx + dx]]
+        if not neighbours:
+            stack.pop()
+            continue
+        nx, ny = neighbours[rng.integers(len(neighbours))]
+        visited[ny, nx] = True
+        # the two cells and the wall between them
+        top, left = 1 + min(cy, ny) * pitch, 1 + min(cx, nx) * pitch
+        bottom, right = 1 + max(cy, ny) * pitch + corridor, 1 + max(cx, nx) * pitch + corridor
+        pixels[top:bottom, left:right] = 255
+        stack.append((nx, ny))
+
+    first = 1 + corridor // 2
+    last = 1 + (cells - 1) * pitch + corridor // 2
+    floor = np.argwhere((pixels == 255).all(axis=2))
+    rng.shuffle(floor)
+    hazards = max(3, int(len(floor) * hazard_density))
+    pixels[first, first] = START_COLOR
+    pixels[last, last] = END_COLOR
+    for i, (y, x) in enumerate(floor[:hazards]):
+        if (y, x) in ((first, first), (last, last)):
+            continue
+        pixels[y, x] = (TRAP_COLOR, THORN_COLOR, GUARD_COLOR)[i % 3]
+    return pixels
+
+
+def write_maze_png(pixels, directory=None):
+
+    directory = Path(directory or tempfile.mkdtemp(prefix="maze-bench-"))
+    height, width, _ = pixels.shape
+    path = directory / f"generated_{width}x{height}.png"
+    surface = pygame.surfarray.make_surface(pixels.swapaxes(0, 1))
+    pygame.image.save(surface, str(path))
+    return path
+
+
+def best_of(func, repeat=5):
+
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
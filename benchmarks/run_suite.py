@@ -0,0 +1,232 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import ROOT, generate_maze_pixels, write_maze_png
+
+# compiled levels go to a scratch directory, not the repository cache
+os.environ["MAZE_LEVEL_CACHE"] = tempfile.mkdtemp(prefix="maze-bench-cache-")
+
+import Box2D
+import pygame
+
+from guard import Guard
+from level import Level
+from map import Map
+
+# metrics where a larger value is better; every other metric is a time
+HIGHER_IS_BETTER = {"update_ticks_per_second"}
+
+
+def percentiles(timings):
+
+    timings = np.asarray(timings) * 1e3
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+
+def bench_load(path, repeat):
+
+    parse_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Map(str(path), use_cache=False)
+        parse_times.append(time.perf_counter() - start)
+
+    Map(str(path))
+    cached_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        game_map = Map(str(path))
+        cached_times.append(time.perf_counter() - start)
+
+    return {
+        "map_parse_ms": min(parse_times) * 1e3,
+        "map_load_cached_ms": min(cached_times) * 1e3,
+        "wall_rects": len(game_map.wall_rects),
+        "traps": len(game_map.traps),
+        "thorns": len(game_map.thorns),
+        "guards": len(game_map.guards),
+    }
+
+
+def bench_start_level(path, repeat):
+
+    # the map comes from the warm cache, so this is mostly Box2D body creation
+    timings = []
+    for _ in range(repeat):
+        level = Level(1, "hard", "non-gravity", seed=0)
+        start = time.perf_counter()
+        level.start_level(str(path))
+        timings.append(time.perf_counter() - start)
+    return {"start_level_ms": min(timings) * 1e3, "bodies": level.world.world.bodyCount}
+
+
+def bench_physics_step(path, ticks):
+
+    level = Level(1, "easy", "gravity", seed=0)
+    level.start_level(str(path))
+    timings = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        level.world.step()
+        timings.append(time.perf_counter() - start)
+    p50, p99 = percentiles(timings)
+    # the ball comes to rest in gravity mode, so once it sleeps Box2D stops solving it
+    return {"physics_step_p50_ms": p50, "physics_step_p99_ms": p99,
+            "physics_awake_per_step": level.world.awake_total / level.world.step_count}
+
+
+def bench_find_path(path, searches, seed):
+
+    # uncached A* between random open cells, through the guard's own entry point
+    game_map = Map(str(path))
+    open_cells = np.argwhere(game_map.occupancy_grid == 0)
+    rng = np.random.default_rng(seed)
+    guard = Guard((0, 0))
+    timings = []
+    for _ in range(searches):
+        start_cell, end_cell = open_cells[rng.integers(len(open_cells), size=2)]
+        guard.position = start_cell * game_map.scale + game_map.scale // 2
+        target = end_cell * game_map.scale + game_map.scale // 2
+        game_map.pathfinder.cache.clear()
+        start = time.perf_counter()
+        guard._find_path(game_map, target)
+        timings.append(time.perf_counter() - start)
+    p50, p99 = percentiles(timings)
+    return {"find_path_p50_ms": p50, "find_path_p99_ms": p99}
+
+
+def bench_update_and_draw(path, ticks, screen):
+
+    # hard non-gravity: every guard and trap is live and the ball keeps moving
+    level = Level(1, "hard", "non-gravity", seed=0)
+    level.start_level(str(path))
+    update_times = []
+    draw_times = []
+    for tick in range(ticks):
+        level.controller.set_input_bits(1 << ((tick // 60) % 4))
+        start = time.perf_counter()
+        level.update()
+        update_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        level.draw(screen)
+        draw_times.append(time.perf_counter() - start)
+
+    update_p50, update_p99 = percentiles(update_times)
+    draw_p50, draw_p99 = percentiles(draw_times)
+
+    # gravity mode rotates the whole map every frame
+    level.switch_mode("gravity")
+    level.controller.set_input_bits(1 << 2)
+    rotated_times = []
+    for _ in range(ticks):
+        level.update()
+        start = time.perf_counter()
+        level.draw(screen)
+        rotated_times.append(time.perf_counter() - start)
+    rotated_p50, rotated_p99 = percentiles(rotated_times)
+
+    return {
+        "update_p50_ms": update_p50,
+        "update_p99_ms": update_p99,
+        "update_ticks_per_second": len(update_times) / sum(update_times),
+        "draw_p50_ms": draw_p50,
+        "draw_p99_ms": draw_p99,
+        "draw_rotating_p50_ms": rotated_p50,
+        "draw_rotating_p99_ms": rotated_p99,
+    }
+
+
+def git_commit():
+
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+
+    # (size, metric, old, new) for every metric that got worse by more than tolerance
+    regressions = []
+    for size, metrics in results["sizes"].items():
+        old_metrics = baseline.get("sizes", {}).get(size, {})
+        for metric, new in metrics.items():
+            old = old_metrics.get(metric)
+            if not metric.endswith(("_ms", "_per_second")) or not old:
+                continue
+            ratio = old / new if metric in HIGHER_IS_BETTER else new / old
+            if ratio > 1 + tolerance:
+                regressions.append((size, metric, old, new))
+    return regressions
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Benchmark load, step, AI and render on generated mazes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[65, 129, 257, 513])
+    parser.add_argument("--hazard-density", type=float, default=0.003)
+    parser.add_argument("--corridor", type=int, default=7, help="corridor width in pixels, 7 like the shipped mazes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--ticks", type=int, default=120)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results JSON from an earlier commit to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before a metric fails")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1600, 1000))
+    directory = tempfile.mkdtemp(prefix="maze-bench-")
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "box2d": Box2D.__version__,
+        "numpy": np.__version__,
+        "settings": {key: value for key, value in vars(args).items() if key not in ("json", "baseline")},
+        "sizes": {},
+    }
+
+    for size in args.sizes:
+        path = write_maze_png(generate_maze_pixels(size, args.seed, args.hazard_density, args.corridor), directory)
+        metrics = bench_load(path, args.repeat)
+        metrics.update(bench_start_level(path, args.repeat))
+        metrics.update(bench_physics_step(path, args.ticks))
+        metrics.update(bench_find_path(path, args.searches, args.seed))
+        metrics.update(bench_update_and_draw(path, args.ticks, screen))
+        results["sizes"][str(size)] = metrics
+
+        print(f"{size}x{size}: " + ", ".join(
+            f"{name} {value:.3f}" if isinstance(value, float) else f"{name} {value}"
+            for name, value in metrics.items()), flush=True)
+
+    pygame.quit()
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for size, metric, old, new in regressions:
+            print(f"REGRESSION {size}x{size} {metric}: {old:.3f} -> {new:.3f}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
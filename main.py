@@ -1,8 +1,16 @@
+import argparse
+
 from src.game import Game
 
 
 def main():
-    game = Game()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", help="stream every tick's input to this file for src/replay.py")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="present only the changed parts of the screen instead of flipping every frame")
+    args = parser.parse_args()
+
+    game = Game(record_path=args.record, dirty_rects=args.dirty_rects)
 
     game.start_level(1, mode="non-gravity", difficulty="easy")
 
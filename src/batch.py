@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from headless import HeadlessRunner, load_script
+
+Episode = namedtuple("Episode", ["level", "difficulty", "mode", "script", "seed", "seconds"])
+
+# one runner per (level, difficulty, mode) in each worker process, so the map is
+# parsed and the Box2D world built once and then restarted for every episode
+_runners = {}
+
+
+def run_episode(episode):
+
+    key = (episode.level, episode.difficulty, episode.mode)
+    runner = _runners.get(key)
+    if runner is None:
+        runner = HeadlessRunner(episode.level, episode.difficulty, episode.mode)
+        _runners[key] = runner
+
+    runner.restart(episode.script or [], episode.seed)
+    result = runner.run(episode.seconds)
+    result["seed"] = episode.seed
+    return result
+
+
+def run_batch(episodes, workers=None, chunksize=4):
+
+    # results come back in the same order as episodes
+    episodes = list(episodes)
+    if workers == 1:
+        return [run_episode(episode) for episode in episodes]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_episode, episodes, chunksize=chunksize))
+
+
+def all_levels():
+
+    images = Path(__file__).parent.parent / "assets" / "images"
+    return sorted(int(path.stem[4:]) for path in images.glob("maze*.png"))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Run many headless episodes across all CPU cores.")
+    parser.add_argument("--levels", type=int, nargs="+", help="level numbers, all maze*.png by default")
+    parser.add_argument("--difficulty", nargs="+", choices=["easy", "hard"], default=["easy", "hard"])
+    parser.add_argument("--mode", nargs="+", choices=["gravity", "non-gravity"], default=["gravity", "non-gravity"])
+    parser.add_argument("--seeds", type=int, default=1, help="episodes per combination, seeded 0..N-1")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--script", help="input script shared by every episode")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--json", help="write all results to this file")
+    args = parser.parse_args()
+
+    script = load_script(args.script) if args.script else []
+    episodes = [Episode(level, difficulty, mode, script, seed, args.seconds)
+                for level in (args.levels or all_levels())
+                for difficulty in args.difficulty
+                for mode in args.mode
+                for seed in range(args.seeds)]
+
+    results = run_batch(episodes, workers=args.workers)
+
+    for result in results:
+        completion = "-" if result["completion_time"] is None else f"{result['completion_time']:.2f}s"
+        causes = ",".join(cause for _, cause in result["reset_causes"]) or "-"
+        print(f"maze{result['level']} {result['difficulty']:<5} {result['mode']:<11} seed {result['seed']:<3} "
+              f"completed {completion:>8}  resets {result['resets']:<3} {causes}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
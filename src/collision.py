@@ -0,0 +1,66 @@
+import numpy as np
+
+def _hit_indices(mask):
+
+    # one ball gives the hazard indices it hits; a batch gives (ball indices, hazard indices)
+    if mask.ndim == 1:
+        return np.flatnonzero(mask)
+    return np.nonzero(mask)
+
+
+def circle_mask(positions, radius, centers, reaches):
+
+    # positions is one (x, y) or an (n, 2) batch; a hit is a centre closer than reach + radius
+    positions = np.asarray(positions, dtype=np.float64)
+    offsets = positions[..., None, :] - centers
+    limits = reaches + radius
+    return np.einsum("...i,...i->...", offsets, offsets) < limits * limits
+
+
+def square_edge_mask(positions, radius, centers, reaches):
+
+    # the thorn rule: the centre is inside the square grown by its margin and
+    # within one radius of one of its edges
+    positions = np.asarray(positions, dtype=np.float64)
+    offsets = np.abs(positions[..., None, :] - centers)
+    inside = (offsets <= reaches[:, None]).all(axis=-1)
+    return inside & (reaches - offsets.max(axis=-1) < radius)
+
+
+def square_edge_hits(positions, radius, centers, reaches):
+
+    return _hit_indices(square_edge_mask(positions, radius, centers, reaches))
+
+
+class ThornArrays:
+    def __init__(self, thorns=(), thorn_margin=10, cell_size=500):
+
+        # every thorn packed into one set of arrays; reaches include the trigger margin
+        self.thorns = list(thorns)
+        self.centers = np.array([thorn.position for thorn in self.thorns], dtype=np.float64).reshape(-1, 2)
+        self.reaches = np.array([thorn.size // 2 + thorn_margin for thorn in self.thorns], dtype=np.float64)
+
+        # a static uniform grid: each cell lists, in index order, the thorns whose grown square
+        # overlaps it. A hit needs the ball's centre inside that square, so one cell is enough
+        self.cell_size = cell_size
+        cells = {}
+        low = np.floor((self.centers - self.reaches[:, None]) / cell_size).astype(int).tolist()
+        high = np.floor((self.centers + self.reaches[:, None]) / cell_size).astype(int).tolist()
+        for index, ((min_x, min_y), (max_x, max_y)) in enumerate(zip(low, high)):
+            for cell_x in range(min_x, max_x + 1):
+                for cell_y in range(min_y, max_y + 1):
+                    cells.setdefault((cell_x, cell_y), []).append(index)
+        self.cells = {key: np.array(indices, dtype=np.intp) for key, indices in cells.items()}
+
+    def hits(self, positions, radius):
+
+        # the thorn indices hit by one ball, or (ball, thorn) index pairs for a batch;
+        # a single ball only tests the thorns filed under its cell
+        positions = np.asarray(positions, dtype=np.float64)
+        if positions.ndim == 2:
+            return square_edge_hits(positions, radius, self.centers, self.reaches)
+        candidates = self.cells.get((int(positions[0] // self.cell_size), int(positions[1] // self.cell_size)))
+        if candidates is None:
+            return np.empty(0, dtype=np.intp)
+        mask = square_edge_mask(positions, radius, self.centers[candidates], self.reaches[candidates])
+        return candidates[mask]
@@ -1,6 +1,8 @@
 
 import pygame
 
+# the keys packed into a recorded tick, bit i for INPUT_KEYS[i]
+INPUT_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
 
 class Controller:
     def __init__(self, input_type='keyboard'):
@@ -50,3 +52,16 @@ class Controller:
 
         return self.rotation_direction
 
+    def input_bits(self):
+
+        bits = 0
+        for bit, key in enumerate(INPUT_KEYS):
+            if self.key_states[key]:
+                bits |= 1 << bit
+        return bits
+
+    def set_input_bits(self, bits):
+
+        for bit, key in enumerate(INPUT_KEYS):
+            self.key_states[key] = bool(bits & (1 << bit))
+        self._update_control_states()
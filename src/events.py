@@ -0,0 +1,83 @@
+import json
+import sys
+import time
+from collections import Counter, deque, namedtuple
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error", OFF: "off"}
+
+Event = namedtuple("Event", "time level name fields")
+
+
+class EventLog:
+    def __init__(self, capacity=10000, level=WARNING, echo_level=ERROR):
+
+        # events at or above level go into a ring of the last capacity events; those at or
+        # above echo_level are also written to stderr. Callers on per-tick paths test
+        # `event_log.level <= LEVEL` first, so a disabled level costs one comparison
+        self.level = level
+        self.echo_level = echo_level
+        self.events = deque(maxlen=capacity)
+        self.sample_every = {}
+        self.seen = Counter()
+        self.origin = time.perf_counter()
+
+    def set_level(self, level):
+
+        self.level = level
+
+    def sample(self, name, every):
+
+        # keep one in every events called name; 1 or None keeps them all
+        if every and every > 1:
+            self.sample_every[name] = every
+        else:
+            self.sample_every.pop(name, None)
+
+    def emit(self, level, name, /, **fields):
+
+        if level < self.level:
+            return
+        self.seen[name] += 1
+        every = self.sample_every.get(name)
+        if every and (self.seen[name] - 1) % every:
+            return
+
+        event = Event(time.perf_counter() - self.origin, level, name, fields)
+        self.events.append(event)
+        if level >= self.echo_level:
+            details = " ".join(f"{key}={value}" for key, value in fields.items())
+            print(f"[{LEVEL_NAMES.get(level, level)}] {name} {details}".rstrip(), file=sys.stderr)
+
+    def query(self, name=None, min_level=DEBUG, since=None, **fields):
+
+        # the buffered events matching every given filter, oldest first
+        return [event for event in self.events
+                if (name is None or event.name == name) and event.level >= min_level
+                and (since is None or event.time >= since)
+                and all(event.fields.get(key) == value for key, value in fields.items())]
+
+    def counts(self):
+
+        # every event that passed the level, including the ones sampling dropped
+        return dict(self.seen)
+
+    def clear(self):
+
+        self.events.clear()
+        self.seen.clear()
+
+    def export_jsonl(self, path):
+
+        with open(path, "w") as file:
+            for event in self.events:
+                file.write(json.dumps({"time": event.time, "level": LEVEL_NAMES.get(event.level, event.level),
+                                       "name": event.name, "fields": event.fields}, default=str) + "\n")
+
+
+# the game's single event log, shared like the profiler
+event_log = EventLog()
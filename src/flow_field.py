@@ -0,0 +1,110 @@
+from collections import deque
+
+import numpy as np
+
+
+class FlowField:
+    def __init__(self, grid, cell_size=100):
+
+        # grid is the map occupancy grid, indexed [x, y] with 1 for blocked cells
+        self.width, self.height = grid.shape
+        self.cell_size = cell_size
+        self.blocked = grid.astype(bool).ravel().tobytes()
+        self.distance = np.full((self.width, self.height), -1, dtype=np.int32)
+        self.padded_distance = np.pad(self.distance, 1, constant_values=-1)
+        self.target_cell = None
+        self.dirty = False
+
+    def position_to_cell(self, position):
+
+        cell_x = max(0, min(self.width - 1, int(position[0] / self.cell_size)))
+        cell_y = max(0, min(self.height - 1, int(position[1] / self.cell_size)))
+        return (cell_x, cell_y)
+
+    def set_target(self, position):
+
+        # the field is only rebuilt, lazily, once the target has moved to another cell
+        cell = self.position_to_cell(position)
+        if cell != self.target_cell:
+            self.target_cell = cell
+            self.dirty = True
+
+    def _rebuild(self):
+
+        height = self.height
+        blocked = self.blocked
+        distance = [-1] * (self.width * height)
+
+        # the target cell is seeded even when blocked, so a ball resting against a
+        # wall can still be reached from the free cells around it
+        target = self.target_cell[0] * height + self.target_cell[1]
+        distance[target] = 0
+        queue = deque([target])
+
+        while queue:
+            current = queue.popleft()
+            x, y = divmod(current, height)
+            next_distance = distance[current] + 1
+
+            for neighbor_x, neighbor_y in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+
+                if (neighbor_x < 0 or neighbor_x >= self.width or
+                        neighbor_y < 0 or neighbor_y >= height):
+                    continue
+
+                neighbor = neighbor_x * height + neighbor_y
+                if blocked[neighbor] or distance[neighbor] != -1:
+                    continue
+
+                distance[neighbor] = next_distance
+                queue.append(neighbor)
+
+        self.distance = np.array(distance, dtype=np.int32).reshape(self.width, height)
+        self.padded_distance = np.pad(self.distance, 1, constant_values=-1)
+        self.dirty = False
+
+    def next_cell(self, cell):
+
+        # one step downhill: the cell itself at the target, None when the target
+        # is unreachable; a blocked cell steps to its closest reachable neighbour
+        if self.dirty:
+            self._rebuild()
+
+        current = int(self.distance[cell])
+        if current == 0:
+            return cell
+
+        best = None
+        best_distance = current
+        x, y = cell
+        for neighbor_x, neighbor_y in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if not (0 <= neighbor_x < self.width and 0 <= neighbor_y < self.height):
+                continue
+            neighbor_distance = int(self.distance[neighbor_x, neighbor_y])
+            if neighbor_distance != -1 and (best_distance == -1 or neighbor_distance < best_distance):
+                best = (neighbor_x, neighbor_y)
+                best_distance = neighbor_distance
+        return best
+
+    def next_cells(self, cells):
+
+        # next_cell for an (n, 2) array of cells at once; rows that cannot reach
+        # the target come back as -1
+        if self.dirty:
+            self._rebuild()
+
+        padded = self.padded_distance
+        x = cells[:, 0] + 1
+        y = cells[:, 1] + 1
+        current = padded[x, y]
+
+        offsets = np.array(((0, -1), (0, 1), (-1, 0), (1, 0)))
+        neighbor_distance = padded[x[:, None] + offsets[:, 0], y[:, None] + offsets[:, 1]]
+        valid = (neighbor_distance != -1) & ((current[:, None] == -1) | (neighbor_distance < current[:, None]))
+
+        ranked = np.where(valid, neighbor_distance, np.iinfo(np.int32).max)
+        best = ranked.argmin(axis=1)
+        result = cells + offsets[best]
+        result[~valid.any(axis=1)] = -1
+        result[current == 0] = cells[current == 0]
+        return result
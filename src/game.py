@@ -1,29 +1,35 @@
 import pygame
 from level import Level
-from physics import PhysicsWorld
 from player import Player
+from profiler import profiler
+from recording import RecordingWriter
 import sys
+import time
 
 class Game:
-    def __init__(self, screen_width=1600, screen_height=1000):
+    def __init__(self, screen_width=1600, screen_height=1000, max_fps=120, max_substeps=5, record_path=None,
+                 dirty_rects=False):
         pygame.init()
         self.screen = pygame.display.set_mode((screen_width, screen_height))
         self.clock = pygame.time.Clock()
         self.player = Player()
         self.current_level = None
         self.game_mode = None  # 'gravity' or 'non-gravity'
-        self.physics_world = None
+        self.max_fps = max_fps
+        self.max_substeps = max_substeps
+        self.time_step = 1 / 60.0
+        # every tick's input is streamed here; replay.py re-drives the game from it
+        self.recorder = RecordingWriter(record_path) if record_path else None
+        # present only the changed parts of the screen; see Level.draw_dirty
+        self.dirty_rects = dirty_rects
+        self.overlay_rect = None
 
     def start_level(self, level_number, difficulty, mode):
 
         self.current_level = Level(level_number, difficulty, mode)
+        self.current_level.recorder = self.recorder
         self.game_mode = mode
 
-        if mode == 'gravity':
-            self.physics_world = PhysicsWorld(gravity=(0, 9.8), pixels_per_meter=100)
-        else:
-            self.physics_world = PhysicsWorld(gravity=(0, 0), pixels_per_meter=100)
-
         map_file = f"maze{level_number}.png"
         try:
             return self.current_level.start_level(map_file)
@@ -32,25 +38,81 @@ class Game:
             return False
 
 
+    def _handle_profiler_key(self, key):
+
+        # F3 shows or hides the timing overlay, F4 writes what it has collected so far
+        if key == pygame.K_F3:
+            profiler.toggle()
+        elif profiler.history:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            profiler.export_csv(f"profile-{stamp}.csv")
+            profiler.export_chrome_trace(f"profile-{stamp}.json")
+            print(f"profile written to profile-{stamp}.csv and profile-{stamp}.json")
+
+    def _draw_dirty(self, alpha):
+
+        # the profiler panel is translucent, so the level repaints what is under it first
+        panel = profiler.panel()
+        overlay_rects = [rect for rect in (self.overlay_rect, panel and panel[1]) if rect]
+        dirty = self.current_level.draw_dirty(self.screen, alpha, overlay_rects)
+        if panel:
+            self.screen.blit(*panel)
+        self.overlay_rect = panel[1] if panel else None
+
+        with profiler.section("flip"):
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+
     def run(self):
+        # physics advances in fixed 1/60 s ticks, as many per frame as real time asks for,
+        # and rendering interpolates between the last two ticks
         running = True
+        accumulator = 0.0
+        previous_time = time.perf_counter()
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if self.current_level:
-                    self.current_level.controller.handle_event(event)
-                    self.current_level.handle_event(event)
+            now = time.perf_counter()
+            accumulator += min(now - previous_time, 0.25)
+            previous_time = now
 
-            if self.current_level:
-                self.current_level.update()
+            with profiler.section("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    elif event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4):
+                        self._handle_profiler_key(event.key)
+                        continue
+                    if self.current_level:
+                        self.current_level.controller.handle_event(event)
+                        self.current_level.handle_event(event)
 
-            self.screen.fill((255, 255, 255))
-            if self.current_level:
-                self.current_level.draw(self.screen)
+            substeps = 0
+            while accumulator >= self.time_step and substeps < self.max_substeps:
+                if self.current_level:
+                    self.current_level.update()
+                accumulator -= self.time_step
+                substeps += 1
+            if substeps == self.max_substeps:
+                # too far behind to catch up; drop the backlog rather than spiral
+                accumulator = min(accumulator, self.time_step)
+
+            if self.current_level and self.dirty_rects:
+                self._draw_dirty(accumulator / self.time_step)
+            else:
+                # Level.draw covers the whole screen itself
+                if self.current_level:
+                    self.current_level.draw(self.screen, accumulator / self.time_step)
+                else:
+                    self.screen.fill((255, 255, 255))
+                profiler.draw(self.screen)
 
-            pygame.display.flip()
-            self.clock.tick(60)  # 60 FPS
+                with profiler.section("flip"):
+                    pygame.display.flip()
+            profiler.end_frame()
+            self.clock.tick(self.max_fps)
 
+        if self.recorder:
+            self.recorder.close()
         pygame.quit()
-        sys.exit()
\ No newline at end of file
+        sys.exit()
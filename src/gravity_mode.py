@@ -1,26 +1,56 @@
+import math
+
 import numpy as np
-import pygame
 
 class GravityMode:
-    def __init__(self):
+    def __init__(self, gravity=9.8, rotation_speed=1, time_step=1 / 60.0):
         self.last_rotation_direction = None
         self.name = "Gravity Mode"
-        self.rotation_speed = 1
-        self.current_angle = 0
-        self.time_step = 1 / 60.0
+        self.gravity = gravity
+        self.rotation_speed = rotation_speed
+        self.time_step = time_step
+
+        # the world turns in whole steps, rounded so steps_per_turn of them make exactly one
+        # turn; every angle it can reach has its gravity vector computed here once
+        self.steps_per_turn = max(1, round(2 * math.pi / (rotation_speed * time_step)))
+        self.step_angle = 2 * math.pi / self.steps_per_turn
+        steps = np.arange(self.steps_per_turn)
+        steps = np.where(steps > self.steps_per_turn // 2, steps - self.steps_per_turn, steps)
+        self.angles = steps * self.step_angle
+        cos, sin = np.cos(self.angles), np.sin(self.angles)
+        # gravity points down the rotated map, so it turns the other way; plain floats for Box2D
+        self.gravity_vectors = list(zip((-gravity * sin).tolist(), (gravity * cos).tolist()))
+
+        self.angle_index = 0
+        self.current_angle = 0.0
+
+    def reset(self):
+        # back to an upright map; True when that changed the angle
+        changed = self.angle_index != 0
+        self.angle_index = 0
+        self.current_angle = 0.0
+        return changed
 
     def rotate_map(self, direction):
         self.last_rotation_direction = direction
         if direction == 'left':
-            self.current_angle += self.rotation_speed * self.time_step
+            self.angle_index = (self.angle_index + 1) % self.steps_per_turn
         elif direction == 'right':
-            self.current_angle -= self.rotation_speed * self.time_step
-        return self.current_angle
+            self.angle_index = (self.angle_index - 1) % self.steps_per_turn
+        else:
+            return False
+        self.current_angle = float(self.angles[self.angle_index])
+        return True
+
+    @property
+    def gravity_vector(self):
+        return self.gravity_vectors[self.angle_index]
 
     def apply_gravity(self, world):
-        pass
+        world.set_gravity(self.gravity_vector)
+
     def handle_collision(self, world):
         pass
 
     def update_physics(self, world):
-        world.step()
\ No newline at end of file
+        world.step()
@@ -1,13 +1,16 @@
-
 import numpy as np
 import pygame
-from queue import PriorityQueue
+from events import DEBUG, event_log
+from profiler import profiler
+
 
-import time
+GUARD_STATES = ("patrol", "chase", "return")
 
 
 class Guard:
     def __init__(self, position):
+        self.swarm = None
+        self.swarm_index = 0
         self.position = np.array(position, dtype=np.float64)
         self.radius = 100
         self.speed = 300.0
@@ -27,7 +30,69 @@ class Guard:
         self.patrol_points.append(np.array(position))
         self.patrol_points.append(np.array([position[0], position[1] - self.patrol_range]))
 
-    def update(self, game_map, ball_position, current_time):
+    # once attached to a GuardSwarm these read and write the swarm's arrays,
+    # so the guard stays a thin view for drawing and for the per-guard paths
+    @property
+    def position(self):
+
+        if self.swarm is None:
+            return self._position
+        return self.swarm.positions[self.swarm_index]
+
+    @position.setter
+    def position(self, value):
+
+        if self.swarm is None:
+            self._position = value
+        else:
+            self.swarm.positions[self.swarm_index] = value
+
+    @property
+    def state(self):
+
+        if self.swarm is None:
+            return self._state
+        return GUARD_STATES[self.swarm.states[self.swarm_index]]
+
+    @state.setter
+    def state(self, value):
+
+        if self.swarm is None:
+            self._state = value
+        else:
+            self.swarm.states[self.swarm_index] = GUARD_STATES.index(value)
+
+    @property
+    def patrol_target(self):
+
+        if self.swarm is None:
+            return self._patrol_target
+        return int(self.swarm.patrol_targets[self.swarm_index])
+
+    @patrol_target.setter
+    def patrol_target(self, value):
+
+        if self.swarm is None:
+            self._patrol_target = value
+        else:
+            self.swarm.patrol_targets[self.swarm_index] = value
+
+    @property
+    def last_move_time(self):
+
+        if self.swarm is None:
+            return self._last_move_time
+        return float(self.swarm.last_move_times[self.swarm_index])
+
+    @last_move_time.setter
+    def last_move_time(self, value):
+
+        if self.swarm is None:
+            self._last_move_time = value
+        else:
+            self.swarm.last_move_times[self.swarm_index] = value
+
+    def update(self, game_map, ball_position, current_time, flow_field=None):
 
         if current_time - self.last_move_time < 0.5:
             return
@@ -59,7 +124,7 @@ class Guard:
         if self.state == "patrol":
             self._patrol()
         elif self.state == "chase":
-            self._chase(game_map, ball_position)
+            self._chase(game_map, ball_position, flow_field, current_time)
         elif self.state == "return":
             self._return_to_patrol(game_map)
 
@@ -81,11 +146,12 @@ class Guard:
             direction = direction / distance
             self.position = (self.position + direction * min(float(distance), self.speed)).astype(np.float64)
 
-    def _chase(self, game_map, ball_position):
+    def _chase(self, game_map, ball_position, flow_field, current_time):
 
-        current_time = time.time()
-
-        if (not self.path or
+        # current_time is simulation time, so repathing keeps pace with the physics
+        if flow_field is not None:
+            self._follow_flow_field(game_map, ball_position, flow_field)
+        elif (not self.path or
                 current_time - self.pathfinding_cooldown > self.pathfinding_interval):
             self._find_path(game_map, ball_position)
             self.pathfinding_cooldown = current_time
@@ -161,76 +227,38 @@ class Guard:
         y = grid[1] * self.grid_size + self.grid_size / 2 -50
         return np.array([x, y])
 
-    #this method is based upon AI output.
-    def _find_path(self, game_map, target):
-
-        grid = [[0 for _ in range(self.grid_height)] for _ in range(self.grid_width)]
+    def _follow_flow_field(self, game_map, ball_position, flow_field):
 
+        # the shared field already knows the way to the ball, so only the next cell is needed
+        self.grid_width, self.grid_height = flow_field.width, flow_field.height
+        cell = self._position_to_grid(self.position)
+        next_cell = flow_field.next_cell(cell)
 
-        for wall in game_map.walls:
-
-            x, y, w, h = wall
-            grid_x1 = max(0, min(self.grid_width - 1, int(x / self.grid_size)))
-            grid_y1 = max(0, min(self.grid_height - 1, int(y / self.grid_size)))
-            grid_x2 = max(0, min(self.grid_width - 1, int((x + w) / self.grid_size)))
-            grid_y2 = max(0, min(self.grid_height - 1, int((y + h) / self.grid_size)))
-
+        if next_cell is None:
+            self._find_path(game_map, ball_position)
+        elif next_cell == cell:
+            self.path = []
+        else:
+            self.path = [self._grid_to_position(next_cell)]
 
-            for i in range(grid_x1, grid_x2 + 1):
-                for j in range(grid_y1, grid_y2 + 1):
-                    grid[i][j] = 1
+    def _find_path(self, game_map, target):
 
+        pathfinder = game_map.pathfinder
+        self.grid_width, self.grid_height = pathfinder.width, pathfinder.height
 
         start = self._position_to_grid(self.position)
         end = self._position_to_grid(target)
 
+        # guards chasing the same ball share one search through the pathfinder's cache
+        with profiler.section("find_path"):
+            cells = pathfinder.find_path(start, end)
 
-        open_set = PriorityQueue()
-        open_set.put((0, start))
-        came_from = {}
-        g_score = {start: 0}
-        f_score = {start: self._heuristic(start, end)}
-
-        while not open_set.empty():
-            current = open_set.get()[1]
-
-            if current == end:
-
-                self.path = []
-                while current in came_from:
-                    self.path.insert(0, self._grid_to_position(current))
-                    current = came_from[current]
-                return
-
-
-            for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-
-
-                if (neighbor[0] < 0 or neighbor[0] >= self.grid_width or
-                        neighbor[1] < 0 or neighbor[1] >= self.grid_height):
-                    continue
-
-
-                if grid[neighbor[0]][neighbor[1]] == 1:
-                    continue
-
-
-                tentative_g_score = g_score[current] + 1
-
-                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = tentative_g_score + self._heuristic(neighbor, end)
-                    open_set.put((f_score[neighbor], neighbor))
-
-
-        self.path = [target]
-
-    # this method is based upon AI output.
-    def _heuristic(self, a, b):
-
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+        if cells is None:
+            if event_log.level <= DEBUG:
+                event_log.emit(DEBUG, "guard_no_path", start=start, end=end)
+            self.path = [target]
+        else:
+            self.path = [self._grid_to_position(cell) for cell in cells]
 
     def check_collision(self, ball):
 
@@ -244,7 +272,7 @@ class Guard:
                   int(self.position[1] * ui_scale + offset_y))
 
 
-        pygame.draw.circle(screen, (255, 255, 0), ui_pos, ui_radius)
+        drawn = pygame.draw.circle(screen, (255, 255, 0), ui_pos, ui_radius)
 
 
         if self.state == "patrol":
@@ -260,8 +288,10 @@ class Guard:
         for i, point in enumerate(self.path):
             ui_point = (int(point[0] * ui_scale + offset_x),
                         int(point[1] * ui_scale + offset_y))
-            pygame.draw.circle(screen, (0, 0, 255), ui_point, 3)
+            drawn.union_ip(pygame.draw.circle(screen, (0, 0, 255), ui_point, 3))
             if i > 0:
                 prev_point = (int(self.path[i - 1][0] * ui_scale + offset_x),
                               int(self.path[i - 1][1] * ui_scale + offset_y))
-                pygame.draw.line(screen, (0, 0, 255), prev_point, ui_point, 1)
\ No newline at end of file
+                drawn.union_ip(pygame.draw.line(screen, (0, 0, 255), prev_point, ui_point, 1))
+
+        return drawn
\ No newline at end of file
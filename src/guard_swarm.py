@@ -0,0 +1,150 @@
+import numpy as np
+
+from collision import circle_mask
+from guard import GUARD_STATES
+
+PATROL = GUARD_STATES.index("patrol")
+CHASE = GUARD_STATES.index("chase")
+RETURN = GUARD_STATES.index("return")
+
+
+class GuardSwarm:
+    def __init__(self, guards):
+
+        self.guards = list(guards)
+        count = len(self.guards)
+
+        self.positions = np.zeros((count, 2), dtype=np.float64)
+        self.states = np.zeros(count, dtype=np.int8)
+        self.patrol_points = np.zeros((count, 2, 2), dtype=np.float64)
+        self.patrol_targets = np.zeros(count, dtype=np.int64)
+        self.last_move_times = np.zeros(count, dtype=np.float64)
+        self.radii = np.zeros(count, dtype=np.float64)
+        self.speeds = np.zeros(count, dtype=np.float64)
+        self.chase_ranges = np.zeros(count, dtype=np.float64)
+        self.on_path = np.zeros(count, dtype=bool)
+        self.grid_size = 100
+
+        for index, guard in enumerate(self.guards):
+            # copy the guard's own values in before it starts reading them from here
+            self.positions[index] = guard.position
+            self.states[index] = GUARD_STATES.index(guard.state)
+            self.patrol_points[index] = guard.patrol_points[:2]
+            self.patrol_targets[index] = guard.patrol_target
+            self.last_move_times[index] = guard.last_move_time
+            self.radii[index] = guard.radius
+            self.speeds[index] = guard.speed
+            self.chase_ranges[index] = guard.patrol_range * 1.2
+            self.grid_size = guard.grid_size
+            guard.swarm = self
+            guard.swarm_index = index
+
+    def update(self, game_map, ball_position, current_time, flow_field=None):
+
+        # same rules as Guard.update, applied to every guard whose move gate is open;
+        # returns the indices of the guards that moved so their bodies can be synced
+        moving = np.flatnonzero(current_time - self.last_move_times >= 0.5)
+        if len(moving) == 0:
+            return moving
+
+        self.last_move_times[moving] = current_time
+        positions = self.positions[moving]
+        states = self.states[moving]
+        targets = self.patrol_targets[moving]
+
+        distance_to_ball = np.hypot(*(positions - ball_position).T)
+        in_range = distance_to_ball <= self.chase_ranges[moving]
+        patrol_target_points = self.patrol_points[moving, targets]
+        at_patrol_point = np.hypot(*(positions - patrol_target_points).T) < 50
+
+        start_chase = (states == PATROL) & in_range
+        give_up = (states == CHASE) & ~in_range
+        resume_chase = (states == RETURN) & in_range
+        back_on_patrol = (states == RETURN) & ~in_range & at_patrol_point
+
+        states[start_chase | resume_chase] = CHASE
+        states[give_up] = RETURN
+        states[back_on_patrol] = PATROL
+
+        patrol_distances = np.hypot(*(positions[:, None, :] - self.patrol_points[moving]).transpose(2, 0, 1))
+        targets[give_up] = patrol_distances[give_up].argmin(axis=1)
+        targets[back_on_patrol] = 0
+
+        self.states[moving] = states
+        self.patrol_targets[moving] = targets
+        for index in moving[start_chase | give_up | resume_chase]:
+            self.guards[index].path = []
+
+        self._patrol(moving[states == PATROL])
+        self._chase(moving[states == CHASE], game_map, ball_position, flow_field, current_time)
+        returning = moving[states == RETURN]
+        self.on_path[returning] = True
+        for index in returning:
+            self.guards[index]._return_to_patrol(game_map)
+
+        return moving
+
+    def _patrol(self, indices):
+
+        if len(indices) == 0:
+            return
+
+        positions = self.positions[indices]
+        targets = self.patrol_targets[indices]
+        direction = self.patrol_points[indices, targets] - positions
+        distance = np.hypot(*direction.T)
+
+        turn = distance < 50
+        targets[turn] = 1 - targets[turn]
+        self.patrol_targets[indices] = targets
+        direction[turn] = self.patrol_points[indices[turn], targets[turn]] - positions[turn]
+        distance[turn] = np.hypot(*direction[turn].T)
+
+        self._advance(indices, direction, distance)
+
+    def _chase(self, indices, game_map, ball_position, flow_field, current_time):
+
+        if len(indices) == 0:
+            return
+
+        # guards that fall back to their own A* keep a path list; on_path marks
+        # them so the list is cleared once they are back on the flow field
+        if flow_field is None:
+            self.on_path[indices] = True
+            for index in indices:
+                self.guards[index]._chase(game_map, ball_position, None, current_time)
+            return
+
+        # every chasing guard reads its next cell from the shared field in one lookup
+        cells = np.clip((self.positions[indices] / self.grid_size).astype(np.int64), 0,
+                        (flow_field.width - 1, flow_field.height - 1))
+        next_cells = flow_field.next_cells(cells)
+
+        stranded = next_cells[:, 0] == -1
+        self.on_path[indices[stranded]] = True
+        for index in indices[stranded]:
+            self.guards[index]._chase(game_map, ball_position, None, current_time)
+
+        following = indices[~stranded]
+        for index in following[self.on_path[following]]:
+            self.guards[index].path = []
+        self.on_path[following] = False
+
+        stepping = ~stranded & (next_cells != cells).any(axis=1)
+        indices = indices[stepping]
+        waypoints = next_cells[stepping] * self.grid_size + self.grid_size / 2 - 50
+        direction = waypoints - self.positions[indices]
+        self._advance(indices, direction, np.hypot(*direction.T))
+
+    def _advance(self, indices, direction, distance):
+
+        moving = distance > 0
+        indices = indices[moving]
+        step = np.minimum(distance[moving], self.speeds[indices]) / distance[moving]
+        self.positions[indices] += direction[moving] * step[:, None]
+
+    def check_collision(self, ball):
+
+        if len(self.guards) == 0:
+            return False
+        return bool(circle_mask(ball.position, ball.radius, self.positions, self.radii).any())
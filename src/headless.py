@@ -0,0 +1,157 @@
+import argparse
+import time
+from pathlib import Path
+
+import pygame
+
+from controller import Controller
+from events import LEVEL_NAMES, event_log
+from level import Level
+from recording import RecordingWriter
+
+KEY_NAMES = {
+    "up": pygame.K_UP,
+    "down": pygame.K_DOWN,
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+}
+
+
+class ScriptedController(Controller):
+    def __init__(self, script=None):
+        super().__init__(input_type='script')
+        # script is a list of (tick, keys held from that tick on), sorted by tick
+        self.script = sorted(script or [], key=lambda entry: entry[0])
+        self.script_index = 0
+
+    def advance(self, tick):
+
+        while self.script_index < len(self.script) and self.script[self.script_index][0] <= tick:
+            held = set(self.script[self.script_index][1])
+            for name, key in KEY_NAMES.items():
+                self.key_states[key] = name in held
+            self._update_control_states()
+            self.script_index += 1
+
+    def rewind(self):
+
+        self.script_index = 0
+        for key in KEY_NAMES.values():
+            self.key_states[key] = False
+        self._update_control_states()
+
+
+def load_script(path):
+
+    # one "tick key,key" line per change of held keys, e.g. "120 up,left"; "#" starts a comment
+    script = []
+    for line in Path(path).read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        tick, _, keys = line.partition(" ")
+        script.append((int(tick), [key for key in keys.replace(" ", "").split(",") if key]))
+    return script
+
+
+class HeadlessRunner:
+    def __init__(self, level_number, difficulty="easy", mode="non-gravity", script=None, seed=0, recorder=None):
+
+        # no display, fonts or event pump: Level.update and the physics step are driven directly
+        self.level = Level(level_number, difficulty, mode, seed)
+        self.controller = ScriptedController(script)
+        self.level.controller = self.controller
+        self.level.recorder = recorder
+        if not self.level.start_level(f"maze{level_number}.png"):
+            raise ValueError(f"could not start level {level_number}")
+        self.tick = 0
+
+    def restart(self, script=None, seed=None):
+
+        # a fresh episode on the already loaded map and world
+        if seed is not None:
+            self.level.seed = seed
+        self.level.restart()
+        if script is not None:
+            self.controller.script = sorted(script, key=lambda entry: entry[0])
+        self.controller.rewind()
+        self.tick = 0
+
+    @property
+    def sim_time(self):
+
+        return self.level.sim_time
+
+    def step(self):
+
+        self.controller.advance(self.tick)
+        self.level.update()
+        self.tick += 1
+
+    def run(self, seconds, stop_on_completion=True):
+
+        ticks = int(round(seconds / self.level.world.time_step))
+        started = time.perf_counter()
+        completed_tick = None
+        world = self.level.world
+        awake_before, steps_before = world.awake_total, world.step_count
+
+        for _ in range(ticks):
+            self.step()
+            if self.level.is_completed:
+                completed_tick = self.tick
+                if stop_on_completion:
+                    break
+
+        elapsed = time.perf_counter() - started
+        return {
+            "level": self.level.level_number,
+            "difficulty": self.level.difficulty,
+            "mode": self.level.mode,
+            "ticks": self.tick,
+            "sim_seconds": self.sim_time,
+            "completed": completed_tick is not None,
+            "completion_time": None if completed_tick is None else completed_tick * self.level.world.time_step,
+            "resets": self.level.reset_count,
+            "reset_causes": list(self.level.reset_causes),
+            "wall_seconds": elapsed,
+            "ticks_per_second": self.tick / elapsed if elapsed > 0 else float("inf"),
+            # balls Box2D had to solve per physics step; below 1 means the ball slept
+            "awake_per_step": (world.awake_total - awake_before) / max(world.step_count - steps_before, 1),
+        }
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Run a level without a display, as fast as the CPU allows.")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--difficulty", choices=["easy", "hard"], default="easy")
+    parser.add_argument("--mode", choices=["gravity", "non-gravity"], default="non-gravity")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--script", help="input script, one 'tick key,key' line per change")
+    parser.add_argument("--keep-going", action="store_true", help="do not stop when the goal is reached")
+    parser.add_argument("--seed", type=int, default=0, help="seeds the tool's random trap choice")
+    parser.add_argument("--record", help="write a recording that src/replay.py can play back")
+    parser.add_argument("--log-level", choices=list(LEVEL_NAMES.values()), default="warning",
+                        help="lowest event level kept in the event log")
+    parser.add_argument("--events", help="write the logged events to this file, one JSON object per line")
+    args = parser.parse_args()
+
+    event_log.set_level({name: level for level, name in LEVEL_NAMES.items()}[args.log_level])
+
+    script = load_script(args.script) if args.script else []
+    recorder = RecordingWriter(args.record) if args.record else None
+    runner = HeadlessRunner(args.level, args.difficulty, args.mode, script, args.seed, recorder)
+    result = runner.run(args.seconds, stop_on_completion=not args.keep_going)
+    if recorder:
+        recorder.close()
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    if event_log.counts():
+        print(f"events: {event_log.counts()}")
+    if args.events:
+        event_log.export_jsonl(args.events)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,18 @@ import pygame
 from ball import Ball
 from map import Map
 from controller import Controller
+from events import DEBUG, ERROR, INFO, event_log
+from flow_field import FlowField
+from guard_swarm import GuardSwarm
 from gravity_mode import GravityMode
 from non_gravity_mode import NonGravityMode
 from physics import PhysicsWorld
-import time
+from profiler import profiler
+from recording import RESET, TOOL
+from ui import BUTTON_DISABLED_COLOR, Button, button_color, render_text
 
 class Level:
-    def __init__(self, level_number, difficulty, mode):
+    def __init__(self, level_number, difficulty, mode, seed=None):
         self.game = None
         self.victory_time = None
         self.show_victory = None
@@ -27,7 +32,13 @@ class Level:
         self.gravity_mode = GravityMode()
         self.non_gravity_mode = NonGravityMode()
         self.world = None
+        self.sim_time = 0.0
+        # every episode reseeds rng from seed, so the tool picks the same trap on a replay
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.recorder = None
         self.rotation_angle = 0
+        self.map_surface = None
 
         self.start_x = 50
         self.start_y = 200
@@ -60,14 +71,30 @@ class Level:
             right_start_x, self.start_y + 2 * (self.button_height + self.spacing),
             self.button_width, self.button_height
         )
+        self.level_button = Button(self.level_button_rect)
+        self.difficulty_button = Button(self.difficulty_button_rect)
+        self.mode_button = Button(self.mode_button_rect)
+        self.reset_button = Button(self.reset_button_rect)
+        self.tool_button = Button(self.tool_button_rect)
+        self.help_button = Button(self.help_button_rect)
+        self.buttons = [self.level_button, self.difficulty_button, self.mode_button,
+                        self.reset_button, self.tool_button, self.help_button]
+        self.help_panel = None
+
+        # what the last frame drew, so draw_dirty knows what to repaint
+        self.frame_key = None
+        self.sprite_rects = []
 
         self.total_levels = len(glob.glob("assets/images/maze*.png"))
         self.show_level_list = False
         self.is_selecting_level = False
 
         self.guards = []
+        self.guard_swarm = GuardSwarm([])
+        self.flow_field = None
 
         self.reset_count = 0
+        self.reset_causes = []
         self.show_help = False
         self.tool_used = False
 
@@ -81,13 +108,13 @@ class Level:
         try:
             self.game_map = Map(map_file, difficulty=self.difficulty)
         except Exception as e:
-            print(f" 2{e}")
+            event_log.emit(ERROR, "level_load_failed", map=map_file, error=f"{type(e).__name__}: {e}")
             return False
 
 
         start_pos = self.game_map.get_start_position()
         if start_pos is None:
-            print("123")
+            event_log.emit(ERROR, "level_no_start", map=map_file)
             return False
 
         self.ball = Ball(start_pos)
@@ -99,52 +126,122 @@ class Level:
             self.world = PhysicsWorld(gravity=(0, 0), pixels_per_meter=100)
 
 
-        self.ball.box2d_body = self.world.create_ball(
-            position=start_pos,
-            radius=self.ball.radius,
-            density=1.0,
-            friction=0.1,
-            restitution=0.3
-        )
+        self._create_ball_body()
 
 
-        for wall in self.game_map.walls:
-            x, y, w, h = wall
-            self.world.create_static_box(
-                position=(x + w/2, y + h/2),
-                size=(w, h)
-            )
+        self.world.create_static_boxes(self.game_map.wall_rects)
 
 
+        # hazards are tagged so the contact listener reports them, see _check_contacts
         for trap in self.game_map.traps:
-            self.world.create_static_circle(
-                position=trap.position,
-                radius=trap.radius
-            )
+            self._create_trap_body(trap)
 
 
         if self.game_map.end_position:
-            self.world.create_static_circle(
+            goal_body = self.world.create_static_circle(
                 position=self.game_map.end_position,
                 radius=self.game_map.end_radius
             )
+            self.world.tag_body(goal_body, 'goal')
+
+        self._create_difficulty_bodies()
+
+
+        self.rotation_angle = 0
+        self.gravity_mode.reset()
+        self.reset_count = 0
+        self.reset_causes = []
+        self.sim_time = 0.0
+        self._begin_episode()
+        return True
+
+    def _begin_episode(self):
+
+        self.rng.seed(self.seed)
+        if self.recorder:
+            self.recorder.segment(self.level_number, self.difficulty, self.mode, self.seed)
+
+    def _create_ball_body(self):
+
+        self.ball.box2d_body = self.world.create_ball(
+            position=self.game_map.get_start_position(),
+            radius=self.ball.radius,
+            density=1.0,
+            friction=0.1,
+            restitution=0.3
+        )
+        self.world.tag_body(self.ball.box2d_body, 'ball', self.ball)
+
+    def _create_difficulty_bodies(self):
 
+        # thorns need no bodies, _check_contacts tests them all against the ball in one call
+        self.guards = []
         if self.difficulty == 'hard' and self.game_map.guards:
             for guard in self.game_map.guards:
                 guard.box2d_body = self.world.create_guard(
                     position=guard.position,
                     radius=guard.radius
                 )
+                self.world.tag_body(guard.box2d_body, 'guard', guard)
                 self.guards.append(guard)
 
+        self.guard_swarm = GuardSwarm(self.guards)
+        self.flow_field = None
+        if self.guards:
+            self.flow_field = FlowField(self.game_map.occupancy_grid, self.game_map.scale)
 
-        self.rotation_angle = 0
+    def _remove_difficulty_bodies(self):
+
+        for guard in self.guards:
+            self.world.remove_body(guard.box2d_body)
+
+    def _create_trap_body(self, trap):
+
+        trap.box2d_body = self.world.create_static_circle(
+            position=trap.position,
+            radius=trap.radius
+        )
+        self.world.add_sensor_circle(trap.box2d_body, trap.radius + self.game_map.trap_margin,
+                                     'trap', trap)
+
+    def restart(self):
+
+        # back to what start_level leaves behind, keeping the parsed map and the physics world
+        if not self.reset_level("restart"):
+            return False
+
+        for trap in self.game_map.restore_traps():
+            self._create_trap_body(trap)
+        for thorn in self.game_map.thorns:
+            thorn.is_activated = False
+            thorn.is_visible = False
+        self.game_map.invalidate_static_layer()
+
+        # a new ball body drops its contacts and broadphase proxy with it, so a restarted
+        # episode steps exactly like one in a freshly built world
+        self.world.remove_body(self.ball.box2d_body)
+        self._create_ball_body()
+        # sim_time starts over, so every guard clock keyed on it does too
+        for guard in self.guards:
+            guard.last_move_time = 0
+            guard.pathfinding_cooldown = 0
+        self.guard_swarm.on_path[:] = False
+        self.world.set_gravity((0, 9.8) if self.mode == 'gravity' else (0, 0))
+        self.world.drain_contacts()
+
+        self.sim_time = 0.0
         self.reset_count = 0
+        self.reset_causes = []
+        self.tool_used = False
+        self._begin_episode()
         return True
 
-    def reset_level(self):
+    def reset_level(self, cause="manual"):
 
         self.reset_count += 1
+        self.reset_causes.append((self.sim_time, cause))
+        if event_log.level <= INFO:
+            event_log.emit(INFO, "level_reset", level=self.level_number, cause=cause, sim_time=self.sim_time)
         if self.game_map and self.ball:
             start_pos = self.game_map.get_start_position()
             if start_pos:
@@ -152,6 +249,8 @@ class Level:
                 if self.ball.box2d_body:
                     self.ball.box2d_body.position = (start_pos[0]/self.world.PPM, start_pos[1]/self.world.PPM)
                     self.ball.box2d_body.linearVelocity = (0, 0)
+                    # moving a body does not wake it, and a sleeping ball would hang at the start
+                    self.ball.box2d_body.awake = True
 
                 for guard in self.guards:
                     guard.position = np.array(guard.patrol_points[0])
@@ -165,18 +264,28 @@ class Level:
                 self.is_completed = False
                 self.show_victory = False
                 self.rotation_angle = 0
+                # the map is shown upright again, so gravity goes back to pointing down it
+                if self.gravity_mode.reset() and self.mode == 'gravity':
+                    self.gravity_mode.apply_gravity(self.world)
                 return True
         return False
 
     def update(self):
+        # one fixed physics tick; guards are timed on sim_time, never on the wall clock
+        if self.recorder:
+            self.recorder.tick(self.controller.input_bits())
+
         if not self.is_completed and self.ball and self.game_map:
 
             if self.world:
-                self.world.step()
+                with profiler.section("physics"):
+                    self.world.step()
+                self.sim_time += self.world.time_step
 
 
             if self.ball.box2d_body:
-                self.ball.update_from_box2d(self.ball.box2d_body)
+                with profiler.section("ball_sync"):
+                    self.ball.update_from_box2d(self.ball.box2d_body)
 
 
             if self.mode == 'non-gravity':
@@ -185,208 +294,235 @@ class Level:
                     force = np.array(direction) * 10000
                     self.world.apply_force_to_ball(self.ball.box2d_body, force)
             else:
-                rotation = self.controller.get_rotation()
-                if rotation:
-
-                    if rotation == 'left':
-                        self.rotation_angle += self.gravity_mode.rotation_speed * self.gravity_mode.time_step
-
-                        gravity_angle = -self.rotation_angle
-                    elif rotation == 'right':
-                        self.rotation_angle -= self.gravity_mode.rotation_speed * self.gravity_mode.time_step
-
-                        gravity_angle = -self.rotation_angle
-
-
-                    gravity_x = 9.8 * np.sin(gravity_angle)
-                    gravity_y = 9.8 * np.cos(gravity_angle)
-                    self.world.set_gravity((gravity_x, gravity_y))
-
-
-            if self.game_map.end_position:
-                end_pos = np.array(self.game_map.end_position)
-                ball_pos = self.ball.position
-                distance = np.linalg.norm(ball_pos - end_pos)
-                if distance < (self.ball.radius + self.game_map.end_radius):
-                    self.is_completed = True
-                    self.show_victory = True
-
-
+                # GravityMode owns the angle; Box2D only hears about it when it changes
+                if self.gravity_mode.rotate_map(self.controller.get_rotation()):
+                    self.rotation_angle = self.gravity_mode.current_angle
+                    self.gravity_mode.apply_gravity(self.world)
 
-            for trap in self.game_map.traps:
-                trap_pos = np.array(trap.position)
-                ball_pos = self.ball.position
-                distance = np.linalg.norm(ball_pos - trap_pos)
-                if distance < (self.ball.radius + trap.radius + 20):
-                    trap.activate()
-                    self.reset_level()
-                    break
-
-
-            for thorn in self.game_map.thorns:
-                if thorn.check_collision(self.ball):
-                    if thorn.activate():
-                        self.reset_level()
-                        break
-
-            current_time = time.time()
-            for guard in self.guards:
-                guard.update(self.game_map, self.ball.position, current_time)
-
-
-                if guard.box2d_body:
-                    guard.box2d_body.position = (guard.position[0] / self.world.PPM,
-                                                 guard.position[1] / self.world.PPM)
 
+            with profiler.section("hazards"):
+                self._check_contacts()
 
-            for guard in self.guards:
-                if guard.check_collision(self.ball):
-                    self.reset_level()
-                    break
+            with profiler.section("guards"):
+                if self.flow_field:
+                    self.flow_field.set_target(self.ball.position)
+                moved = self.guard_swarm.update(self.game_map, self.ball.position, self.sim_time, self.flow_field)
+                for index in moved:
+                    guard = self.guards[index]
+                    if guard.box2d_body:
+                        guard.box2d_body.position = (guard.position[0] / self.world.PPM,
+                                                     guard.position[1] / self.world.PPM)
+                if len(moved):
+                    # Box2D skips contacts between a static guard and a sleeping ball
+                    if not self.ball.box2d_body.awake and self.guard_swarm.check_collision(self.ball):
+                        self.ball.box2d_body.awake = True
+
+
+    def _check_contacts(self):
+
+        # Box2D's broadphase already found what the ball touched during the step;
+        # traps use a sensor ring 20px wider than the trap, matching the old distance check
+        for kind, hazard in self.world.drain_contacts():
+            if event_log.level <= DEBUG:
+                self._log_hit(kind, hazard)
+            if kind == 'goal':
+                self.is_completed = True
+                self.show_victory = True
+                if event_log.level <= INFO:
+                    event_log.emit(INFO, "level_completed", level=self.level_number, sim_time=self.sim_time,
+                                   resets=self.reset_count)
+            elif kind == 'trap':
+                hazard.activate()
+                self.reset_level('trap')
+                return
+            elif kind == 'guard':
+                self.reset_level('guard')
+                return
+
+        # a thorn only fires near its edge; all of them are tested in one vectorized call
+        thorns = self.game_map.thorn_arrays
+        for index in thorns.hits(self.ball.position, self.ball.radius):
+            thorn = thorns.thorns[index]
+            if event_log.level <= DEBUG:
+                self._log_hit('thorn', thorn)
+            if thorn.activate():
+                self.game_map.invalidate_static_layer()
+                self.reset_level('thorn')
+                return
+
+    def _log_hit(self, kind, hazard):
+
+        # the goal is tagged without an object, its position is the map's end
+        position = self.game_map.end_position if hazard is None else hazard.position
+        event_log.emit(DEBUG, "hazard_hit", kind=kind, position=np.asarray(position).tolist(),
+                       ball=self.ball.position.tolist(), sim_time=self.sim_time)
 
     def use_tool(self):
 
         self.tool_used = True
+        if event_log.level <= INFO:
+            event_log.emit(INFO, "tool_used", level=self.level_number, difficulty=self.difficulty)
 
         if self.difficulty == 'easy':
 
             if self.game_map.traps:
-                trap_to_remove = random.choice(self.game_map.traps)
-                self.game_map.traps.remove(trap_to_remove)
+                trap_to_remove = self.rng.choice(self.game_map.traps)
+                self.game_map.remove_trap(trap_to_remove)
+                self.world.remove_body(trap_to_remove.box2d_body)
         elif self.difficulty == 'hard':
 
-            for thorn in self.game_map.thorns:
-                thorn.is_visible = True
+            self.game_map.reveal_thorns()
 
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
 
         if not self.game_map:
             return
 
 
+        self.game_map.calculate_offset(screen.get_width(), screen.get_height())
         map_center_x = self.game_map.ui_width // 2 + self.game_map.offset_x
         map_center_y = self.game_map.ui_height // 2 + self.game_map.offset_y
 
 
         screen.fill((240, 240, 240))
 
-        rotated_screen = pygame.Surface((screen.get_width(), screen.get_height()), pygame.SRCALPHA)
-        self.game_map.draw(rotated_screen)
-        if self.ball:
-            self.ball.draw(rotated_screen, self.game_map.offset_x, self.game_map.offset_y, self.game_map.ui_scale)
-
-        for guard in self.guards:
-            guard.draw(rotated_screen, self.game_map.offset_x, self.game_map.offset_y, self.game_map.ui_scale)
+        # only the map region is composed and rotated, into a surface kept across frames
+        map_size = (self.game_map.ui_width, self.game_map.ui_height)
+        if self.map_surface is None or self.map_surface.get_size() != map_size:
+            self.map_surface = pygame.Surface(map_size, pygame.SRCALPHA)
 
+        with profiler.section("map_draw"):
+            static_layer = self.game_map.get_static_layer()
+            self.map_surface.blit(static_layer, (0, 0))
+            self.sprite_rects = self._draw_sprites(alpha)
 
-        if self.rotation_angle != 0:
-            rotated_image = pygame.transform.rotate(rotated_screen, np.degrees(self.rotation_angle))
-            rotated_rect = rotated_image.get_rect(center=(map_center_x, map_center_y))
-            screen.blit(rotated_image, rotated_rect)
-        else:
-            screen.blit(rotated_screen, (0, 0))
 
+        with profiler.section("rotation"):
+            if self.rotation_angle != 0:
+                rotated_image = pygame.transform.rotate(self.map_surface, np.degrees(self.rotation_angle))
+                rotated_rect = rotated_image.get_rect(center=(map_center_x, map_center_y))
+                screen.blit(rotated_image, rotated_rect)
+            else:
+                screen.blit(self.map_surface, (self.game_map.offset_x, self.game_map.offset_y))
 
-        button_width = 250
-        button_height = 100
-        spacing = 150
-        start_x = 50
-        start_y = 200
-
-
-        mouse_pos = pygame.mouse.get_pos()
-
-
-        button_color1 = (220, 220, 220)
-        if not self.is_selecting_level and self.level_button_rect.collidepoint(mouse_pos):
-            button_color1 = (180, 180, 255)
-        pygame.draw.rect(screen, button_color1, self.level_button_rect)
-        button_color2 = (220, 220, 220)
-        if not self.is_selecting_level and self.difficulty_button_rect.collidepoint(mouse_pos):
-            button_color2 = (180, 180, 255)
-        pygame.draw.rect(screen, button_color2, self.difficulty_button_rect)
-        button_color3 = (220, 220, 220)
-        if not self.is_selecting_level and self.mode_button_rect.collidepoint(mouse_pos):
-            button_color3 = (180, 180, 255)
-        pygame.draw.rect(screen, button_color3, self.mode_button_rect)
-
-        font = pygame.font.SysFont(None, 36)
+        with profiler.section("ui"):
+            self._draw_ui(screen)
 
+        self.frame_key = self._frame_key(screen, static_layer)
 
-        level_text = font.render(f"Level: {self.level_number}", True, (0, 0, 0))
-        screen.blit(level_text, (self.level_button_rect.centerx - level_text.get_width() // 2,
-                                 self.level_button_rect.centery - level_text.get_height() // 2))
+    def _draw_sprites(self, alpha):
 
+        # ball and guards into map_surface; the rects their draw() calls return are what
+        # draw_dirty restores from the static layer and presents on the next frame
+        rects = []
+        if self.ball:
+            # once completed no more ticks run, so there is nothing left to blend toward
+            rects.append(self.ball.draw(self.map_surface, 0, 0, self.game_map.ui_scale,
+                                        1.0 if self.is_completed else alpha))
 
-        diff_text = font.render(f"Difficulty: {self.difficulty}", True, (0, 0, 0))
-        screen.blit(diff_text, (self.difficulty_button_rect.centerx - diff_text.get_width() // 2,
-                                self.difficulty_button_rect.centery - diff_text.get_height() // 2))
+        for guard in self.guards:
+            rects.append(guard.draw(self.map_surface, 0, 0, self.game_map.ui_scale))
+        return rects
 
-        mode_text = font.render(f"Mode: {self.mode}", True, (0, 0, 0))
-        screen.blit(mode_text, (self.mode_button_rect.centerx - mode_text.get_width() // 2,
-                                self.mode_button_rect.centery - mode_text.get_height() // 2))
+    def _frame_key(self, screen, static_layer):
 
-        reset_color = (220, 220, 220)
-        if self.reset_button_rect.collidepoint(mouse_pos):
-            reset_color = (180, 180, 255)
-        pygame.draw.rect(screen, reset_color, self.reset_button_rect)
-        reset_text = font.render(f"Reset: {self.reset_count}", True, (0, 0, 0))
-        screen.blit(reset_text, (self.reset_button_rect.centerx - reset_text.get_width() // 2,
-                                 self.reset_button_rect.centery - reset_text.get_height() // 2))
+        # while this stays the same, only sprites and button faces can differ between frames
+        return (screen.get_size(), self.game_map, static_layer, self.rotation_angle, self.show_help,
+                self.show_level_list, self.is_completed and self.show_victory)
 
+    def draw_dirty(self, screen, alpha=1.0, extra_rects=()):
 
+        # repaints only the screen areas that changed since the last frame and returns them;
+        # anything else (rotation, a new static layer, an overlay opening) falls back to draw()
+        # and returns None, meaning the whole screen has to be presented
+        if not self.game_map:
+            return None
+
+        self.game_map.calculate_offset(screen.get_width(), screen.get_height())
+        static_layer = self.game_map.get_static_layer()
+        if (self.map_surface is None or self.rotation_angle != 0 or self.show_level_list or
+                self._frame_key(screen, static_layer) != self.frame_key):
+            self.draw(screen, alpha)
+            return None
+
+        offset = (self.game_map.offset_x, self.game_map.offset_y)
+        with profiler.section("map_draw"):
+            previous_rects = self.sprite_rects
+            for rect in previous_rects:
+                self.map_surface.blit(static_layer, rect, rect)
+            self.sprite_rects = self._draw_sprites(alpha)
+            dirty = [rect.move(offset) for rect in previous_rects + self.sprite_rects]
+
+        with profiler.section("ui"):
+            mouse_pos = pygame.mouse.get_pos()
+            for button, label, color in self._button_states(mouse_pos):
+                if button.update(label, color):
+                    dirty.append(button.rect)
+            dirty.extend(extra_rects)
+
+            # each rect is rebuilt bottom to top, in the order draw() paints the screen
+            for rect in dirty:
+                screen.set_clip(rect)
+                screen.fill((240, 240, 240))
+                screen.blit(self.map_surface, offset)
+                for button in self.buttons:
+                    screen.blit(button.face, button.rect)
+                if self.show_help:
+                    screen.blit(self.help_panel, self.tool_button_rect.topleft)
+                if self.is_completed and self.show_victory:
+                    self._draw_victory(screen)
+            screen.set_clip(None)
+        return dirty
+
+    def _button_states(self, mouse_pos):
+
+        # (button, label, colour) for every button as it should look this frame
+        hoverable = not self.is_selecting_level
         if self.reset_count >= 10 and not self.tool_used:
-            tool_color = (220, 220, 220)
-            if self.tool_button_rect.collidepoint(mouse_pos):
-                tool_color = (180, 180, 255)
+            tool_color = button_color(self.tool_button_rect, mouse_pos)
         else:
-            tool_color = (150, 150, 150)
-        pygame.draw.rect(screen, tool_color, self.tool_button_rect)
-        tool_text = font.render("Tool", True, (0, 0, 0))
-        screen.blit(tool_text, (self.tool_button_rect.centerx - tool_text.get_width() // 2,
-                                self.tool_button_rect.centery - tool_text.get_height() // 2))
-
-
-        help_color = (220, 220, 220)
-        if self.help_button_rect.collidepoint(mouse_pos):
-            help_color = (180, 180, 255)
-        pygame.draw.rect(screen, help_color, self.help_button_rect)
-        help_text = font.render("Help", True, (0, 0, 0))
-        screen.blit(help_text, (self.help_button_rect.centerx - help_text.get_width() // 2,
-                                self.help_button_rect.centery - help_text.get_height() // 2))
+            tool_color = BUTTON_DISABLED_COLOR
+        return [
+            (self.level_button, f"Level: {self.level_number}",
+             button_color(self.level_button_rect, mouse_pos, hoverable)),
+            (self.difficulty_button, f"Difficulty: {self.difficulty}",
+             button_color(self.difficulty_button_rect, mouse_pos, hoverable)),
+            (self.mode_button, f"Mode: {self.mode}", button_color(self.mode_button_rect, mouse_pos, hoverable)),
+            (self.reset_button, f"Reset: {self.reset_count}", button_color(self.reset_button_rect, mouse_pos)),
+            (self.tool_button, "Tool", tool_color),
+            (self.help_button, "Help", button_color(self.help_button_rect, mouse_pos)),
+        ]
+
+    def _draw_victory(self, screen):
+
+        victory_text = render_text("Success!", 72, (255, 0, 0))
+        text_rect = victory_text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
+        screen.blit(victory_text, text_rect)
+
+    def _draw_ui(self, screen):
 
+        button_width = 250
+        start_x = 50
 
-        if self.show_help:
-            help_box = pygame.Rect(
-                self.tool_button_rect.left,
-                self.tool_button_rect.top,
-                300,
-                200
-            )
-            pygame.draw.rect(screen, (255, 255, 230), help_box)
-            pygame.draw.rect(screen, (100, 100, 100), help_box, 2)
 
-            help_title = font.render("Tool Usage", True, (0, 0, 0))
-            screen.blit(help_title, (help_box.left + 20, help_box.top + 15))
+        mouse_pos = pygame.mouse.get_pos()
 
 
-            help_font = pygame.font.SysFont(None, 20)
-            help_desc1 = help_font.render("Easy Mode: Remove one random trap", True, (0, 0, 0))
-            help_desc2 = help_font.render("Hard Mode: Reveal all thorns", True, (0, 0, 0))
+        # labels and fonts come from ui's caches; a button face is only re-rendered when it changes
+        for button, label, color in self._button_states(mouse_pos):
+            button.draw(screen, label, color)
 
-            help_condition = help_font.render("Available after 10 resets", True, (0, 0, 0))
 
-            screen.blit(help_desc1, (help_box.left + 20, help_box.top + 60))
-            screen.blit(help_desc2, (help_box.left + 20, help_box.top + 100))
-            screen.blit(help_condition, (help_box.left + 20, help_box.top + 140))
-            help_once = help_font.render("Can be used once per level", True, (0, 0, 0))
-            screen.blit(help_once, (help_box.left + 20, help_box.top + 180))
+        if self.show_help:
+            if self.help_panel is None:
+                self.help_panel = self._render_help_panel()
+            screen.blit(self.help_panel, self.tool_button_rect.topleft)
 
         if self.show_level_list:
             list_start_y = self.level_button_rect.bottom + 50
 
-            level_list_text = font.render("choose:", True, (0, 0, 0))
+            level_list_text = render_text("choose:", 36)
             screen.blit(level_list_text, (start_x, list_start_y))
 
 
@@ -411,26 +547,67 @@ class Level:
                 if level_num == self.level_number:
                     pygame.draw.rect(screen, (180, 230, 255), level_rect)
 
-                level_text = font.render(f"maze{level_num}.png", True, (0, 0, 0))
+                level_text = render_text(f"maze{level_num}.png", 36)
                 screen.blit(level_text, (level_rect.x + 10, level_rect.centery - level_text.get_height() // 2))
 
 
         if self.is_completed and self.show_victory:
-            victory_font = pygame.font.SysFont(None, 72)
-            victory_text = victory_font.render("Success!", True, (255, 0, 0))
-            text_rect = victory_text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
-            screen.blit(victory_text, text_rect)
+            self._draw_victory(screen)
+
+    def _render_help_panel(self):
+
+        # the help box never changes, so it is drawn once
+        help_box = pygame.Rect(0, 0, 300, 200)
+        panel = pygame.Surface(help_box.size)
+        pygame.draw.rect(panel, (255, 255, 230), help_box)
+        pygame.draw.rect(panel, (100, 100, 100), help_box, 2)
+
+        panel.blit(render_text("Tool Usage", 36), (help_box.left + 20, help_box.top + 15))
+        panel.blit(render_text("Easy Mode: Remove one random trap", 20), (help_box.left + 20, help_box.top + 60))
+        panel.blit(render_text("Hard Mode: Reveal all thorns", 20), (help_box.left + 20, help_box.top + 100))
+        panel.blit(render_text("Available after 10 resets", 20), (help_box.left + 20, help_box.top + 140))
+        panel.blit(render_text("Can be used once per level", 20), (help_box.left + 20, help_box.top + 180))
+        return panel
 
     def switch_mode(self, new_mode):
 
         if new_mode in ['gravity', 'non-gravity']:
             self.mode = new_mode
 
-            map_file = f"maze{self.level_number}.png"
-            self.start_level(map_file)
+            # the walls do not depend on the mode: restart sets the new gravity
+            if not self.restart_in_place():
+                self.start_level(f"maze{self.level_number}.png")
+            return True
+        return False
+
+    def switch_difficulty(self, new_difficulty):
+
+        if new_difficulty in ['easy', 'hard']:
+            self.difficulty = new_difficulty
+
+            if self.game_map and self.world:
+                # only the thorn and guard bodies are swapped, the walls stay in the world
+                self._remove_difficulty_bodies()
+                self.game_map.set_difficulty(new_difficulty)
+                self._create_difficulty_bodies()
+            if not self.restart_in_place():
+                self.start_level(f"maze{self.level_number}.png")
             return True
         return False
 
+    def restart_in_place(self):
+
+        # what start_level would do for the same map, without re-reading it or rebuilding the world
+        if not (self.game_map and self.world and self.restart()):
+            return False
+        self.attempts += 1
+        return True
+
+    def _record_action(self, code):
+
+        if self.recorder:
+            self.recorder.action(code)
+
     def handle_event(self, event):
         if event.type == pygame.QUIT:
             running = False
@@ -467,13 +644,7 @@ class Level:
             if not self.is_selecting_level:
                 if self.difficulty_button_rect.collidepoint(mouse_pos):
 
-                    if self.difficulty == "easy":
-                        self.difficulty = "hard"
-                    else:
-                        self.difficulty = "easy"
-
-                    map_file = f"maze{self.level_number}.png"
-                    self.start_level(map_file)
+                    self.switch_difficulty("hard" if self.difficulty == "easy" else "easy")
 
                 if self.mode_button_rect.collidepoint(mouse_pos):
 
@@ -481,11 +652,13 @@ class Level:
                     self.switch_mode(new_mode)
 
                 if self.reset_button_rect.collidepoint(mouse_pos):
+                    self._record_action(RESET)
                     self.reset_level()
 
                 if (self.tool_button_rect.collidepoint(mouse_pos) and
                         self.reset_count >= 10 and
                         not self.tool_used):
+                    self._record_action(TOOL)
                     self.use_tool()
 
                 if self.help_button_rect.collidepoint(mouse_pos):
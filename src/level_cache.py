@@ -0,0 +1,69 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# bump whenever compile_pixels changes what it produces
+CACHE_VERSION = 1
+
+ARRAY_NAMES = ("wall_mask", "wall_rects", "occupancy_grid",
+               "start_cells", "end_cells", "trap_cells", "thorn_cells", "guard_cells")
+
+
+def cache_dir():
+
+    return Path(os.environ.get("MAZE_LEVEL_CACHE", Path(__file__).parent.parent / ".level_cache"))
+
+
+def _entry_path(image_path):
+
+    # keyed on the PNG's bytes, so an edited level never loads a stale compile
+    digest = hashlib.sha1(Path(image_path).read_bytes()).hexdigest()[:16]
+    return cache_dir() / f"{Path(image_path).stem}-{digest}-v{CACHE_VERSION}"
+
+
+def load_compiled_level(image_path):
+
+    # the arrays are memory-mapped; None when there is no usable entry yet
+    entry = _entry_path(image_path)
+    if not entry.is_dir():
+        return None
+    try:
+        return {name: np.load(entry / f"{name}.npy", mmap_mode="r") for name in ARRAY_NAMES}
+    except (OSError, ValueError):
+        return None
+
+
+def save_compiled_level(image_path, compiled):
+
+    # written to a temporary directory and renamed into place, so concurrent
+    # batch workers never see half an entry; a read-only cache is not an error
+    entry = _entry_path(image_path)
+    staging = None
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".tmp-", dir=entry.parent))
+        for name in ARRAY_NAMES:
+            np.save(staging / f"{name}.npy", np.ascontiguousarray(compiled[name]))
+        # we only save after a failed load, so an entry already there is broken;
+        # os.replace cannot rename over a non-empty directory
+        if entry.exists():
+            shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.replace(staging, entry)
+        except OSError:
+            # another process got there first
+            return False
+        staging = None
+        for stale in entry.parent.glob(f"{Path(image_path).stem}-*"):
+            if stale != entry and stale.name.rsplit("-", 2)[0] == Path(image_path).stem:
+                shutil.rmtree(stale, ignore_errors=True)
+    except OSError:
+        return False
+    finally:
+        if staging is not None:
+            shutil.rmtree(staging, ignore_errors=True)
+    return True
@@ -1,27 +1,121 @@
+import numpy as np
 import pygame
 from thorn import Thorn
 from trap import Trap
 from guard import Guard
+from pathfinding import GridPathfinder
+from collision import ThornArrays
+from level_cache import load_compiled_level, save_compiled_level
 from pathlib import Path
 
+
+WALL_COLOR = (0, 0, 0)
+START_COLOR = (0, 255, 0)
+END_COLOR = (0, 0, 255)
+TRAP_COLOR = (255, 0, 0)
+THORN_COLOR = (255, 0, 255)
+GUARD_COLOR = (255, 255, 0)
+
+
+def _pack_color(color):
+
+    return (color[0] << 16) | (color[1] << 8) | color[2]
+
+
+def merge_wall_rects(mask):
+
+    # greedily grow each unclaimed wall cell right, then down, into the
+    # largest rectangle that is still fully wall and not yet claimed
+    remaining = mask.copy()
+    height, width = remaining.shape
+    rects = []
+
+    for y in range(height):
+        for x in np.flatnonzero(remaining[y]).tolist():
+            if not remaining[y, x]:
+                continue
+
+            x_end = x + 1
+            while x_end < width and remaining[y, x_end]:
+                x_end += 1
+
+            y_end = y + 1
+            while y_end < height and remaining[y_end, x:x_end].all():
+                y_end += 1
+
+            remaining[y:y_end, x:x_end] = False
+            rects.append((x, y, x_end - x, y_end - y))
+
+    return rects
+
+
+def build_occupancy_grid(wall_mask):
+
+    # indexed [x, y] like the guards' grid cells; a wall tile from (x, y) to
+    # (x + w, y + h) also blocks the cells on its far edges, as the guards always had it
+    walls = wall_mask.T
+    grid = walls.copy()
+    grid[1:, :] |= walls[:-1, :]
+    grid[:, 1:] |= walls[:, :-1]
+    grid[1:, 1:] |= walls[:-1, :-1]
+    return grid.astype(np.uint8)
+
+
+def compile_pixels(image_array):
+
+    # everything Map needs from the image, in cell units, as plain arrays that
+    # level_cache can store; cell lists are (x, y) rows in row-major pixel order
+    pixels = image_array.astype(np.uint32)
+    packed = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+
+    def cells(color):
+        ys, xs = np.nonzero(packed == _pack_color(color))
+        return np.stack([xs, ys], axis=1).astype(np.int32)
+
+    wall_mask = packed == _pack_color(WALL_COLOR)
+    return {
+        "wall_mask": wall_mask,
+        "wall_rects": np.array(merge_wall_rects(wall_mask), dtype=np.int32).reshape(-1, 4),
+        "occupancy_grid": build_occupancy_grid(wall_mask),
+        "start_cells": cells(START_COLOR),
+        "end_cells": cells(END_COLOR),
+        "trap_cells": cells(TRAP_COLOR),
+        "thorn_cells": cells(THORN_COLOR),
+        "guard_cells": cells(GUARD_COLOR),
+    }
+
+
 class Map:
-    def __init__(self, image_path, scale=100, difficulty="hard"):
+    def __init__(self, image_path, scale=100, difficulty="hard", use_cache=True):
 
         self.difficulty = difficulty
         base_dir = Path(__file__).parent.parent
         full_path = base_dir / "assets" / "images" / image_path
 
-        try:
-            self.image = pygame.image.load(str(full_path))
-            self.image_array = pygame.surfarray.array3d(self.image).swapaxes(0, 1)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"{full_path}")
-        except pygame.error:
-            raise ValueError(f" {full_path}")
+        # a compiled copy of the PNG skips both the decode and the parse
+        compiled = None
+        if use_cache:
+            try:
+                compiled = load_compiled_level(full_path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"{full_path}")
+
+        if compiled is None:
+            try:
+                self.image = pygame.image.load(str(full_path))
+                self.image_array = pygame.surfarray.array3d(self.image).swapaxes(0, 1)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"{full_path}")
+            except pygame.error:
+                raise ValueError(f" {full_path}")
+            self.raw_width = self.image.get_width()
+            self.raw_height = self.image.get_height()
+        else:
+            self.image = None
+            self.image_array = None
+            self.raw_height, self.raw_width = compiled["wall_mask"].shape
 
         self.scale = scale
-        self.raw_width = self.image.get_width()
-        self.raw_height = self.image.get_height()
         self.game_width = self.raw_width * scale
         self.game_height = self.raw_height * scale
 
@@ -31,8 +125,18 @@ class Map:
         self.ui_height = int(self.game_height * self.ui_scale)
 
 
-        self.walls = []
+        self.compiled = None
+        self._walls = None
+        self.wall_mask = None
+        self.wall_rects = []
+        self.occupancy_grid = None
+        self.pathfinder = None
+        self.thorn_arrays = None
+        # the trap sensor ring Level builds and the thorn edge reach ThornArrays tests
+        self.trap_margin = 20
+        self.thorn_margin = 10
         self.traps = []
+        self.removed_traps = []
         self.thorns = []
         self.start_position = None
         self.end_position = None
@@ -44,45 +148,85 @@ class Map:
         self.offset_x = 0
         self.offset_y = 0
         self.guards = []
-        self.parse_map()
+        self._static_layer = None
+
+        if compiled is None:
+            self.parse_map()
+            if use_cache:
+                save_compiled_level(full_path, self.compiled)
+        else:
+            self.load_compiled(compiled)
 
     def parse_map(self):
 
-        height, width, _ = self.image_array.shape
+        self.load_compiled(compile_pixels(self.image_array))
+
+    def load_compiled(self, compiled):
 
-        for y in range(height):
-            for x in range(width):
-                pixel = self.image_array[y, x]
+        self.compiled = compiled
+        self.wall_mask = compiled["wall_mask"]
+        self._walls = None
+        self.wall_rects = [(x * self.scale, y * self.scale, w * self.scale, h * self.scale)
+                           for x, y, w, h in compiled["wall_rects"].tolist()]
+        self.occupancy_grid = compiled["occupancy_grid"]
+        self.pathfinder = GridPathfinder(self.occupancy_grid)
 
-                if (pixel == [0, 0, 0]).all():
-                    self.walls.append((x * self.scale, y * self.scale,
-                                       self.scale, self.scale))
+        # cells are listed in the same row-major order as the old pixel loop,
+        # so when a colour appears more than once the last cell still wins
+        for x, y in compiled["start_cells"].tolist():
+            self.start_position = self._cell_center(x, y)
 
-                elif (pixel == [0, 255, 0]).all():
-                    self.start_position = (x * self.scale + self.scale // 2,
-                                           y * self.scale + self.scale // 2)
+        for x, y in compiled["end_cells"].tolist():
+            self.end_position = self._cell_center(x, y)
+            self.end_radius = self.obstacle_radius
 
-                elif (pixel == [255, 0, 0]).all():
-                    trap_pos = (x * self.scale + self.scale // 2,
-                                y * self.scale + self.scale // 2)
-                    self.traps.append(Trap(trap_pos, self.obstacle_radius))
+        for x, y in compiled["trap_cells"].tolist():
+            self.traps.append(Trap(self._cell_center(x, y), self.obstacle_radius))
 
-                elif (pixel == [255, 0, 255]).all():
-                    if self.difficulty == "hard":
-                        thorn_pos = (x * self.scale + self.scale // 2,
-                                 y * self.scale + self.scale // 2)
-                        self.thorns.append(Thorn(thorn_pos, size=300))
+        self._load_difficulty_objects()
+        self.thorn_arrays = ThornArrays(self.thorns, self.thorn_margin, self.scale * 5)
 
-                elif (pixel == [255, 255, 0]).all():
-                    if self.difficulty == "hard":
-                        guard_pos = (x * self.scale + self.scale // 2,
-                                     y * self.scale + self.scale // 2)
-                        self.guards.append(Guard(guard_pos))
+    def _load_difficulty_objects(self):
 
-                elif (pixel == [0, 0, 255]).all():
-                    self.end_position = (x * self.scale + self.scale // 2,
-                                         y * self.scale + self.scale // 2)
-                    self.end_radius = self.obstacle_radius
+        self.thorns = []
+        self.guards = []
+        if self.difficulty == "hard":
+            for x, y in self.compiled["thorn_cells"].tolist():
+                self.thorns.append(Thorn(self._cell_center(x, y), size=300))
+
+            for x, y in self.compiled["guard_cells"].tolist():
+                self.guards.append(Guard(self._cell_center(x, y)))
+
+    def set_difficulty(self, difficulty):
+
+        # only thorns and guards depend on the difficulty; walls, traps and the
+        # pathfinder are kept, so switching does not touch the image again
+        self.difficulty = difficulty
+        self._load_difficulty_objects()
+        self.thorn_arrays = ThornArrays(self.thorns, self.thorn_margin, self.scale * 5)
+        self.invalidate_static_layer()
+
+    @property
+    def walls(self):
+
+        # one rect per wall pixel; nothing in the game reads these any more, and on a
+        # large map they cost more than the rest of a cached load, so they are built on request
+        if self._walls is None:
+            self._walls = [] if self.wall_mask is None else [
+                (x * self.scale, y * self.scale, self.scale, self.scale)
+                for y, x in self._cells(self.wall_mask)]
+        return self._walls
+
+    @staticmethod
+    def _cells(mask):
+
+        ys, xs = np.nonzero(mask)
+        return zip(ys.tolist(), xs.tolist())
+
+    def _cell_center(self, x, y):
+
+        return (x * self.scale + self.scale // 2,
+                y * self.scale + self.scale // 2)
 
     def get_start_position(self):
 
@@ -95,68 +239,100 @@ class Map:
         self.offset_x = (screen_width - self.ui_width) // 2
         self.offset_y = (screen_height - self.ui_height) // 2
 
-    def draw(self, screen, rotation_angle=0):
+    def remove_trap(self, trap):
 
-        self.calculate_offset(screen.get_width(), screen.get_height())
+        self.traps.remove(trap)
+        self.removed_traps.append(trap)
+        self.invalidate_static_layer()
 
+    def restore_traps(self):
 
-        screen.fill((240, 240, 240))
+        restored = self.removed_traps
+        self.removed_traps = []
+        for trap in restored:
+            self.traps.append(trap)
+        if restored:
+            self.invalidate_static_layer()
+        return restored
 
+    def reveal_thorns(self):
 
-        for wall in self.walls:
+        for thorn in self.thorns:
+            thorn.is_visible = True
+        self.invalidate_static_layer()
+
+    def invalidate_static_layer(self):
+
+        self._static_layer = None
+
+    def _render_static_layer(self):
+
+        # everything that only changes through remove_trap/reveal_thorns is drawn
+        # once here in map-local coordinates, Level.draw then just blits it
+        layer = pygame.Surface((self.ui_width, self.ui_height))
+        layer.fill((240, 240, 240))
+
+        for wall in self.wall_rects:
             x, y, w, h = wall
 
-            screen_rect = pygame.Rect(
-                x * self.ui_scale + self.offset_x,
-                y * self.ui_scale + self.offset_y,
+            layer_rect = pygame.Rect(
+                x * self.ui_scale,
+                y * self.ui_scale,
                 w * self.ui_scale,
                 h * self.ui_scale
             )
-            pygame.draw.rect(screen, (0, 0, 0), screen_rect)
-
+            pygame.draw.rect(layer, (0, 0, 0), layer_rect)
 
         for trap in self.traps:
 
-            screen_pos = (
-                trap.position[0] * self.ui_scale + self.offset_x,
-                trap.position[1] * self.ui_scale + self.offset_y
+            layer_pos = (
+                trap.position[0] * self.ui_scale,
+                trap.position[1] * self.ui_scale
             )
 
             pygame.draw.circle(
-                screen,
+                layer,
                 trap.color,
-                (int(screen_pos[0]), int(screen_pos[1])),
+                (int(layer_pos[0]), int(layer_pos[1])),
                 int(trap.radius * self.ui_scale)
             )
 
         for thorn in self.thorns:
             if thorn.is_visible:
 
-                screen_pos = (
-                    thorn.position[0] * self.ui_scale + self.offset_x,
-                    thorn.position[1] * self.ui_scale + self.offset_y
+                layer_pos = (
+                    thorn.position[0] * self.ui_scale,
+                    thorn.position[1] * self.ui_scale
                 )
 
                 pygame.draw.rect(
-                    screen,
+                    layer,
                     thorn.color,
-                    (screen_pos[0] - thorn.size // 2 * self.ui_scale,
-                     screen_pos[1] - thorn.size // 2 * self.ui_scale,
+                    (layer_pos[0] - thorn.size // 2 * self.ui_scale,
+                     layer_pos[1] - thorn.size // 2 * self.ui_scale,
                      thorn.size * self.ui_scale,
                      thorn.size * self.ui_scale)
                 )
 
-
         if self.end_position:
 
-            screen_pos = (
-                self.end_position[0] * self.ui_scale + self.offset_x,
-                self.end_position[1] * self.ui_scale + self.offset_y
+            layer_pos = (
+                self.end_position[0] * self.ui_scale,
+                self.end_position[1] * self.ui_scale
             )
 
             pygame.draw.circle(
-                screen,
+                layer,
                 (0, 0, 255),
-                (int(screen_pos[0]), int(screen_pos[1])),
+                (int(layer_pos[0]), int(layer_pos[1])),
                 int(self.end_radius * self.ui_scale)
-            )
\ No newline at end of file
+            )
+
+        return layer
+
+    def get_static_layer(self):
+
+        # map-sized at the fixed ui_scale, so only invalidate_static_layer makes it stale
+        if self._static_layer is None:
+            self._static_layer = self._render_static_layer()
+        return self._static_layer
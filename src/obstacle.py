@@ -15,7 +15,6 @@ class Obstacle:
 
 
         if distance < self.radius + ball.radius:
-            print(f"[DEBUG] {self.position},  {ball.position}")
             ball.reset_position()
             return True
         return False
@@ -0,0 +1,99 @@
+import heapq
+from collections import OrderedDict
+
+
+class GridPathfinder:
+    def __init__(self, grid, cache_size=1024):
+
+        # grid is indexed [x, y] with 1 for blocked cells; cells are stored flat
+        # as x * height + y so heap ties break in the same order as (x, y) tuples
+        self.width, self.height = grid.shape
+        self.size = self.width * self.height
+        self.blocked = grid.astype(bool).ravel().tobytes()
+
+        self.g_score = [0] * self.size
+        self.came_from = [-1] * self.size
+        self.seen = [0] * self.size
+        self.closed = [0] * self.size
+        self.search_id = 0
+
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+    def find_path(self, start, end):
+
+        key = (start, end)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        cells = self.search(start, end)
+        self.cache[key] = cells
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return cells
+
+    def search(self, start, end):
+
+        # the score arrays are reused between searches; search_id marks which
+        # entries belong to the current one so nothing has to be cleared
+        self.search_id += 1
+        search_id = self.search_id
+        height = self.height
+        blocked = self.blocked
+        g_score = self.g_score
+        came_from = self.came_from
+        seen = self.seen
+        closed = self.closed
+
+        start_index = start[0] * height + start[1]
+        end_index = end[0] * height + end[1]
+        end_x, end_y = end
+
+        g_score[start_index] = 0
+        came_from[start_index] = -1
+        seen[start_index] = search_id
+        open_set = [(abs(start[0] - end_x) + abs(start[1] - end_y), start_index)]
+
+        while open_set:
+            current = heapq.heappop(open_set)[1]
+
+            if current == end_index:
+                return self._reconstruct(current)
+
+            if closed[current] == search_id:
+                continue
+            closed[current] = search_id
+
+            x, y = divmod(current, height)
+            tentative_g_score = g_score[current] + 1
+
+            for neighbor_x, neighbor_y in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+
+                if (neighbor_x < 0 or neighbor_x >= self.width or
+                        neighbor_y < 0 or neighbor_y >= height):
+                    continue
+
+                neighbor = neighbor_x * height + neighbor_y
+                if blocked[neighbor] or closed[neighbor] == search_id:
+                    continue
+
+                if seen[neighbor] != search_id or tentative_g_score < g_score[neighbor]:
+                    seen[neighbor] = search_id
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    heuristic = abs(neighbor_x - end_x) + abs(neighbor_y - end_y)
+                    heapq.heappush(open_set, (tentative_g_score + heuristic, neighbor))
+
+        return None
+
+    def _reconstruct(self, current):
+
+        # walk the parents back to the start, then flip once; the start cell itself is not part of the path
+        cells = []
+        came_from = self.came_from
+        while came_from[current] != -1:
+            cells.append(divmod(current, self.height))
+            current = came_from[current]
+        cells.reverse()
+        return tuple(cells)
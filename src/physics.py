@@ -1,12 +1,39 @@
 import pygame
 import Box2D
-from Box2D import b2World, b2PolygonShape, b2CircleShape, b2_staticBody, b2_dynamicBody
+from Box2D import (b2World, b2PolygonShape, b2CircleShape, b2ContactListener,
+                   b2_staticBody, b2_dynamicBody)
 import numpy as np
 
 
+class HazardContactListener(b2ContactListener):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def _ball_contact(self, contact):
+
+        # fixtures carry {'type': tag, 'object': obj} as user data; only ball contacts matter
+        data_a = contact.fixtureA.userData
+        data_b = contact.fixtureB.userData
+        if not data_a or not data_b:
+            return None
+        if data_a['type'] == 'ball':
+            return data_b
+        if data_b['type'] == 'ball':
+            return data_a
+        return None
+
+    def BeginContact(self, contact):
+
+        data = self._ball_contact(contact)
+        if data is None:
+            return
+        self.events.append((data['type'], data['object']))
+
+
 class PhysicsWorld:
     def __init__(self, gravity=(0, 9.8), pixels_per_meter=100, time_step=1 / 60.0, velocity_iterations=6,
-                 position_iterations=2):
+                 position_iterations=2, allow_sleep=True):
 
         self.world = b2World(gravity=gravity)
         self.PPM = pixels_per_meter
@@ -14,11 +41,26 @@ class PhysicsWorld:
         self.velocity_iterations = velocity_iterations
         self.position_iterations = position_iterations
         self.bodies = {}
-        self.rotation_center = None
+        self.balls = []
+        # a ball at rest sleeps with its Box2D island until something wakes it; awake_count
+        # is how many balls the last step solved, awake_total / step_count the running average
+        self.allow_sleep = allow_sleep
+        self.awake_count = 0
+        self.awake_total = 0
+        self.step_count = 0
+        self.contact_listener = HazardContactListener()
+        self.world.contactListener = self.contact_listener
 
     def set_gravity(self, gravity):
 
+        # Box2D leaves sleeping bodies asleep when gravity changes
         self.world.gravity = gravity
+        self.wake_balls()
+
+    def wake_balls(self):
+
+        for body in self.balls:
+            body.awake = True
 
     # this method is based upon AI output.
     def create_ball(self, position, radius, density=1.0, friction=0.1, restitution=0.1):
@@ -30,7 +72,7 @@ class PhysicsWorld:
         body_def = Box2D.b2BodyDef()
         body_def.type = b2_dynamicBody
         body_def.position = position_m
-        body_def.allowSleep = False
+        body_def.allowSleep = self.allow_sleep
 
 
         body = self.world.CreateBody(body_def)
@@ -49,6 +91,7 @@ class PhysicsWorld:
             'radius': radius,
             'body': body
         }
+        self.balls.append(body)
         return body
 
     # this method is based upon AI output.
@@ -81,6 +124,35 @@ class PhysicsWorld:
         }
         return body
 
+    def create_static_boxes(self, rects):
+
+        # one static body carrying a fixture per rectangle, rects are (x, y, w, h) in pixels
+        body_def = Box2D.b2BodyDef()
+        body_def.type = b2_staticBody
+        body_def.position = (0, 0)
+
+        body = self.world.CreateBody(body_def)
+
+        for x, y, w, h in rects:
+            half_width = w / (2 * self.PPM)
+            half_height = h / (2 * self.PPM)
+            center_m = ((x + w / 2) / self.PPM, (y + h / 2) / self.PPM)
+
+            shape = b2PolygonShape(box=(half_width, half_height, center_m, 0))
+            fixture_def = Box2D.b2FixtureDef(
+                shape=shape,
+                friction=0.4,
+                restitution=0.1
+            )
+            body.CreateFixture(fixture_def)
+
+        self.bodies[id(body)] = {
+            'type': 'wall',
+            'rects': list(rects),
+            'body': body
+        }
+        return body
+
     # this method is based upon AI output.
     def create_static_circle(self, position, radius):
 
@@ -143,46 +215,35 @@ class PhysicsWorld:
         }
         return body
 
-    def remove_body(self, body):
-
-        if body and id(body) in self.bodies:
-            self.world.DestroyBody(body)
-            del self.bodies[id(body)]
-
-    def set_rotation_center(self, center):
-
-        self.rotation_center = center
-
-    def rotate_world(self, angle):
+    def tag_body(self, body, tag, user_object=None):
 
-        if self.rotation_center:
-            center_m = (self.rotation_center[0] / self.PPM,
-                        self.rotation_center[1] / self.PPM)
+        for fixture in body.fixtures:
+            fixture.userData = {'type': tag, 'object': user_object}
 
-            self.world.gravity = (0, 9.8)
-
-
-            for body_id, data in self.bodies.items():
-                if data['type'] == 'ball':
-                    body = data['body']
-                    body.angle += angle
-
-                    pos = body.position
-                    rel_x = pos[0] - center_m[0]
-                    rel_y = pos[1] - center_m[1]
+    def add_sensor_circle(self, body, radius, tag, user_object=None):
 
+        # a sensor reports contacts without pushing the ball, e.g. a trap's trigger margin
+        fixture_def = Box2D.b2FixtureDef(
+            shape=b2CircleShape(radius=radius / self.PPM),
+            isSensor=True,
+            userData={'type': tag, 'object': user_object}
+        )
+        return body.CreateFixture(fixture_def)
 
-                    new_x = rel_x * np.cos(angle) - rel_y * np.sin(angle)
-                    new_y = rel_x * np.sin(angle) + rel_y * np.cos(angle)
+    def drain_contacts(self):
 
-                    new_pos = (center_m[0] + new_x, center_m[1] + new_y)
-                    body.position = new_pos
+        # (tag, object) for every hazard the ball started touching since the last drain
+        events = self.contact_listener.events
+        self.contact_listener.events = []
+        return events
 
+    def remove_body(self, body):
 
-                    vel_x, vel_y = body.linearVelocity
-                    new_vel_x = vel_x * np.cos(angle) - vel_y * np.sin(angle)
-                    new_vel_y = vel_x * np.sin(angle) + vel_y * np.cos(angle)
-                    body.linearVelocity = (new_vel_x, new_vel_y)
+        if body and id(body) in self.bodies:
+            if self.bodies[id(body)]['type'] == 'ball':
+                self.balls.remove(body)
+            self.world.DestroyBody(body)
+            del self.bodies[id(body)]
 
     def step(self):
 
@@ -193,6 +254,10 @@ class PhysicsWorld:
         )
         self.world.ClearForces()
 
+        self.awake_count = sum(1 for body in self.balls if body.awake)
+        self.awake_total += self.awake_count
+        self.step_count += 1
+
     def get_body_position(self, body):
 
         pos_m = body.position
@@ -0,0 +1,165 @@
+import csv
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+from ui import text_cache
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+
+        self.profiler.add(self.name, self.start, time.perf_counter())
+
+
+class _NullSection:
+
+    def __enter__(self):
+
+        pass
+
+    def __exit__(self, *exc_info):
+
+        pass
+
+
+_NULL_SECTION = _NullSection()
+
+
+class Profiler:
+    def __init__(self, capacity=600, span_capacity=50000):
+
+        # per-frame totals in one ring of capacity frames per section, plus the last
+        # span_capacity raw spans for the Chrome trace; nothing is timed until enabled
+        self.enabled = False
+        self.capacity = capacity
+        self.frame_index = 0
+        self.frame_numbers = np.full(capacity, -1, dtype=np.int64)
+        self.history = {}
+        self.current = {}
+        self.spans = deque(maxlen=span_capacity)
+        self.origin = time.perf_counter()
+        self.last_frame_end = None
+
+    def toggle(self):
+
+        self.enabled = not self.enabled
+        self.current = {}
+        self.last_frame_end = None
+
+    def section(self, name):
+
+        # a section can run several times a frame (physics substeps, path searches); they add up
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def add(self, name, start, end):
+
+        self.current[name] = self.current.get(name, 0.0) + (end - start) * 1000
+        self.spans.append((name, start, end))
+
+    def end_frame(self):
+
+        if not self.enabled:
+            return
+
+        # the whole frame, end to end, including the time spent waiting on the clock
+        now = time.perf_counter()
+        if self.last_frame_end is not None:
+            self.add("frame", self.last_frame_end, now)
+        self.last_frame_end = now
+
+        slot = self.frame_index % self.capacity
+        self.frame_numbers[slot] = self.frame_index
+        for name in self.current:
+            if name not in self.history:
+                self.history[name] = np.full(self.capacity, np.nan)
+        for name, ring in self.history.items():
+            ring[slot] = self.current.get(name, 0.0)
+        self.current = {}
+        self.frame_index += 1
+
+    def _frame_order(self):
+
+        # ring slots from the oldest kept frame to the newest
+        filled = min(self.frame_index, self.capacity)
+        return (np.arange(filled) + self.frame_index - filled) % self.capacity
+
+    def stats(self):
+
+        # name -> (p50, p99) in milliseconds over the frames still in the ring
+        order = self._frame_order()
+        stats = {}
+        for name, ring in self.history.items():
+            values = ring[order]
+            values = values[~np.isnan(values)]
+            if len(values):
+                p50, p99 = np.percentile(values, (50, 99))
+                stats[name] = (float(p50), float(p99))
+        return stats
+
+    def export_csv(self, path):
+
+        order = self._frame_order()
+        names = sorted(self.history)
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame"] + [f"{name}_ms" for name in names])
+            for slot in order:
+                writer.writerow([int(self.frame_numbers[slot])] +
+                                ["" if np.isnan(self.history[name][slot]) else f"{self.history[name][slot]:.4f}"
+                                 for name in names])
+
+    def export_chrome_trace(self, path):
+
+        # loads in chrome://tracing or Perfetto; nested sections show as nested slices
+        events = [{"name": name, "ph": "X", "pid": 1, "tid": 1,
+                   "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6}
+                  for name, start, end in self.spans]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    def panel(self, position=(10, 10)):
+
+        # the overlay surface and the screen rect it goes to, or None while disabled
+        if not self.enabled:
+            return None
+
+        # the numbers change every frame, so only the font is cached, not the rendered lines
+        font = text_cache.font(16, "monospace")
+        lines = [f"{'section':<12}{'p50 ms':>8}{'p99 ms':>8}"]
+        lines += [f"{name:<12}{p50:>8.2f}{p99:>8.2f}" for name, (p50, p99) in sorted(self.stats().items())]
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 16
+
+        panel = pygame.Surface((width, line_height * len(lines) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for index, line in enumerate(lines):
+            panel.blit(font.render(line, True, (255, 255, 255)), (8, 6 + index * line_height))
+        return panel, panel.get_rect(topleft=position)
+
+    def draw(self, screen, position=(10, 10)):
+
+        panel = self.panel(position)
+        if panel:
+            screen.blit(*panel)
+
+
+# the game's single profiler, shared by every module that times a section
+profiler = Profiler()
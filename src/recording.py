@@ -0,0 +1,108 @@
+import queue
+import struct
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+# a recording is MAGIC, VERSION and then a stream of bytes:
+#   0x00-0x0f  one physics tick, bit i set while Controller.INPUT_KEYS[i] is held
+#   SEGMENT    followed by SEGMENT_FORMAT: an episode (re)started with this level, difficulty, mode and seed
+#              (version 1 stored the seed as an unsigned 32-bit field, and is still read)
+#   RESET      the reset button was pressed before the next tick
+#   TOOL       the tool was used before the next tick
+MAGIC = b"MZRP"
+VERSION = 2
+SEGMENT = 0x80
+RESET = 0x81
+TOOL = 0x82
+SEGMENT_FORMAT = struct.Struct("<HBBq")
+SEGMENT_FORMATS = {1: struct.Struct("<HBBI"), VERSION: SEGMENT_FORMAT}
+SEED_RANGE = range(-2 ** 63, 2 ** 63)
+
+DIFFICULTIES = ("easy", "hard")
+MODES = ("gravity", "non-gravity")
+
+Segment = namedtuple("Segment", ["level", "difficulty", "mode", "seed", "events"])
+
+
+class RecordingWriter:
+    def __init__(self, path, flush_every=600):
+
+        # bytes are collected in memory and handed to a writer thread every
+        # flush_every bytes (10 s of play), so the game loop never waits on the disk
+        self.file = open(path, "wb")
+        self.buffer = bytearray(MAGIC + bytes([VERSION]))
+        self.flush_every = flush_every
+        self.chunks = queue.Queue()
+        self.thread = threading.Thread(target=self._write_chunks, daemon=True)
+        self.thread.start()
+
+    def segment(self, level_number, difficulty, mode, seed):
+
+        # a seed the field cannot hold would replay as a different episode
+        if seed not in SEED_RANGE:
+            raise ValueError(f"seed {seed} does not fit a recording's 64-bit seed field")
+        self.buffer.append(SEGMENT)
+        self.buffer += SEGMENT_FORMAT.pack(level_number, DIFFICULTIES.index(difficulty), MODES.index(mode), seed)
+
+    def action(self, code):
+
+        self.buffer.append(code)
+
+    def tick(self, input_bits):
+
+        self.buffer.append(input_bits)
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+
+        if self.buffer:
+            self.chunks.put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def _write_chunks(self):
+
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                break
+            self.file.write(chunk)
+            self.file.flush()
+
+    def close(self):
+
+        self.flush()
+        self.chunks.put(None)
+        self.thread.join()
+        self.file.close()
+
+
+def read_recording(path):
+
+    data = Path(path).read_bytes()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a recording")
+    segment_format = SEGMENT_FORMATS.get(data[len(MAGIC)])
+    if segment_format is None:
+        raise ValueError(f"{path} has recording version {data[len(MAGIC)]}, expected {VERSION}")
+
+    # a recording cut off mid-header (the game was killed) still replays up to there
+    segments = []
+    position = len(MAGIC) + 1
+    while position < len(data):
+        if data[position] != SEGMENT:
+            raise ValueError(f"{path}: expected a segment header at byte {position}")
+        header_end = position + 1 + segment_format.size
+        if header_end > len(data):
+            break
+        level_number, difficulty, mode, seed = segment_format.unpack_from(data, position + 1)
+
+        # tick and action bytes never equal SEGMENT, only header fields can
+        events_end = data.find(SEGMENT, header_end)
+        if events_end == -1:
+            events_end = len(data)
+        segments.append(Segment(level_number, DIFFICULTIES[difficulty], MODES[mode], seed,
+                                data[header_end:events_end]))
+        position = events_end
+    return segments
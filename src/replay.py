@@ -0,0 +1,116 @@
+import argparse
+import time
+
+import pygame
+
+from level import Level
+from recording import RESET, TOOL, read_recording
+
+
+def start_segment(level, segment):
+
+    # the same calls the game made when the episode began, so the world is in the same state
+    level.seed = segment.seed
+    level.mode = segment.mode
+    if level.world and level.level_number == segment.level:
+        if level.difficulty != segment.difficulty:
+            return level.switch_difficulty(segment.difficulty)
+        return level.switch_mode(segment.mode)
+    level.level_number = segment.level
+    level.difficulty = segment.difficulty
+    return level.start_level(f"maze{segment.level}.png")
+
+
+def play_segment(level, segment):
+
+    # re-drives one recorded episode, yielding after every tick
+    if not start_segment(level, segment):
+        raise ValueError(f"could not start level {segment.level}")
+    for code in segment.events:
+        if code == RESET:
+            level.reset_level()
+        elif code == TOOL:
+            level.use_tool()
+        else:
+            level.controller.set_input_bits(code)
+            level.update()
+            yield
+
+
+def replay_headless(segments):
+
+    level = Level(segments[0].level, segments[0].difficulty, segments[0].mode, segments[0].seed)
+    results = []
+    for segment in segments:
+        started = time.perf_counter()
+        ticks = sum(1 for _ in play_segment(level, segment))
+        results.append({
+            "level": segment.level,
+            "difficulty": segment.difficulty,
+            "mode": segment.mode,
+            "seed": segment.seed,
+            "ticks": ticks,
+            "completed": level.is_completed,
+            "resets": level.reset_count,
+            "reset_causes": list(level.reset_causes),
+            "ball_position": level.ball.position.tolist(),
+            "wall_seconds": time.perf_counter() - started,
+        })
+    return results
+
+
+def replay_rendered(segments, speed=1, screen_size=(1600, 1000)):
+
+    # speed ticks per frame at 60 frames a second, so speed 4 plays four times faster than the game ran
+    pygame.init()
+    screen = pygame.display.set_mode(screen_size)
+    clock = pygame.time.Clock()
+    level = Level(segments[0].level, segments[0].difficulty, segments[0].mode, segments[0].seed)
+
+    for segment in segments:
+        ticks = play_segment(level, segment)
+        playing = True
+        while playing:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    return
+
+            for _ in range(speed):
+                if next(ticks, None) is None:
+                    playing = False
+                    break
+
+            screen.fill((255, 255, 255))
+            level.draw(screen)
+            pygame.display.flip()
+            clock.tick(60)
+
+    pygame.quit()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Replay a recording made with --record.")
+    parser.add_argument("recording")
+    parser.add_argument("--render", action="store_true", help="show the replay instead of running it headless")
+    parser.add_argument("--speed", type=int, default=4, help="ticks per rendered frame")
+    args = parser.parse_args()
+
+    segments = read_recording(args.recording)
+    if not segments:
+        raise SystemExit(f"{args.recording} holds no episodes")
+
+    if args.render:
+        replay_rendered(segments, args.speed)
+        return
+
+    for result in replay_headless(segments):
+        causes = ",".join(cause for _, cause in result["reset_causes"]) or "-"
+        print(f"maze{result['level']} {result['difficulty']:<5} {result['mode']:<11} seed {result['seed']:<10} "
+              f"ticks {result['ticks']:<7} completed {str(result['completed']):<5} "
+              f"resets {result['resets']:<3} {causes}")
+
+
+if __name__ == "__main__":
+    main()
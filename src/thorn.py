@@ -1,6 +1,7 @@
 import pygame
 import math
 from src.obstacle import Obstacle
+from events import INFO, event_log
 
 
 class Thorn(Obstacle):
@@ -36,6 +37,8 @@ class Thorn(Obstacle):
     def activate(self):
         self.is_activated = True
         self.is_visible = True
+        if event_log.level <= INFO:
+            event_log.emit(INFO, "thorn_activated", position=self.position.tolist())
         return True
 
     def draw(self, screen):
@@ -1,5 +1,6 @@
 import pygame
 from obstacle import Obstacle
+from events import INFO, event_log
 
 class Trap(Obstacle):
     def __init__(self, position, radius=150):
@@ -9,7 +10,8 @@ class Trap(Obstacle):
     def activate(self):
 
         super().activate()
-        print(f"3{self.position}")
+        if event_log.level <= INFO:
+            event_log.emit(INFO, "trap_activated", position=self.position.tolist())
         return True
 
     def draw(self, screen):
@@ -0,0 +1,82 @@
+from collections import OrderedDict
+
+import pygame
+
+TEXT_COLOR = (0, 0, 0)
+BUTTON_COLOR = (220, 220, 220)
+BUTTON_HOVER_COLOR = (180, 180, 255)
+BUTTON_DISABLED_COLOR = (150, 150, 150)
+
+
+class TextCache:
+    def __init__(self, capacity=256):
+
+        # SysFont searches the system fonts on every call, so each font is
+        # opened once; rendered labels are kept until capacity evicts the oldest
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.capacity = capacity
+
+    def font(self, size, name=None):
+
+        key = (name, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.SysFont(name, size)
+        return self.fonts[key]
+
+    def render(self, text, size, color=TEXT_COLOR):
+
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.font(size).render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+text_cache = TextCache()
+
+
+def render_text(text, size, color=TEXT_COLOR):
+
+    return text_cache.render(text, size, color)
+
+
+class Button:
+    def __init__(self, rect, font_size=36):
+
+        self.rect = pygame.Rect(rect)
+        self.font_size = font_size
+        self.face = None
+        self.state = None
+
+    def update(self, label, color):
+
+        # the face is only re-rendered when its label or colour changes; returns
+        # True when it did, so the caller knows this rect needs repainting
+        if (label, color) == self.state:
+            return False
+        self.state = (label, color)
+        if self.face is None:
+            self.face = pygame.Surface(self.rect.size)
+        self.face.fill(color)
+        text = render_text(label, self.font_size)
+        self.face.blit(text, text.get_rect(center=(self.rect.width // 2, self.rect.height // 2)))
+        return True
+
+    def draw(self, screen, label, color):
+
+        changed = self.update(label, color)
+        screen.blit(self.face, self.rect)
+        return changed
+
+
+def button_color(rect, mouse_pos, hoverable=True):
+
+    if hoverable and rect.collidepoint(mouse_pos):
+        return BUTTON_HOVER_COLOR
+    return BUTTON_COLOR
@@ -0,0 +1,104 @@
+import numpy as np
+
+from level import Level
+
+
+class MazeVectorEnv:
+    def __init__(self, level_numbers, difficulty="easy", mode="non-gravity", num_envs=None, patch_radius=3,
+                 max_steps=3600, seed=0):
+
+        # num_envs independent levels stepped in lockstep without any rendering; level_numbers
+        # is cycled over the envs, so one level number gives num_envs copies of that maze
+        if isinstance(level_numbers, int):
+            level_numbers = [level_numbers]
+        self.num_envs = num_envs or len(level_numbers)
+        self.level_numbers = [level_numbers[index % len(level_numbers)] for index in range(self.num_envs)]
+        self.patch_radius = patch_radius
+        self.max_steps = max_steps
+
+        self.levels = []
+        for index, level_number in enumerate(self.level_numbers):
+            level = Level(level_number, difficulty, mode, seed + index)
+            if not level.start_level(f"maze{level_number}.png"):
+                raise ValueError(f"could not start level {level_number}")
+            self.levels.append(level)
+
+        # the wall cells of each maze indexed [x, y] (not the pathfinding grid, which is dilated),
+        # padded as blocked so patches near the edge need no clipping
+        self.scale = self.levels[0].game_map.scale
+        self.padded_grids = [np.pad(level.game_map.wall_mask.T.astype(np.uint8), patch_radius, constant_values=1)
+                             for level in self.levels]
+        self.max_guards = max(len(level.guards) for level in self.levels)
+
+        # every array handed out is allocated once here and overwritten in place each step;
+        # copy what you want to keep past the next call
+        patch_size = 2 * patch_radius + 1
+        self.observations = {
+            "ball": np.zeros((self.num_envs, 4), dtype=np.float32),
+            "guards": np.zeros((self.num_envs, self.max_guards, 2), dtype=np.float32),
+            "guards_valid": np.zeros((self.num_envs, self.max_guards), dtype=bool),
+            "patch": np.zeros((self.num_envs, patch_size, patch_size), dtype=np.uint8),
+        }
+        for index, level in enumerate(self.levels):
+            self.observations["guards_valid"][index, :len(level.guards)] = True
+        self.rewards = np.zeros(self.num_envs, dtype=np.float32)
+        self.terminated = np.zeros(self.num_envs, dtype=bool)
+        self.truncated = np.zeros(self.num_envs, dtype=bool)
+        self.episode_steps = np.zeros(self.num_envs, dtype=np.int64)
+
+    def reset(self, seed=None):
+
+        for index, level in enumerate(self.levels):
+            if seed is not None:
+                level.seed = seed + index
+            level.restart()
+        self.episode_steps[:] = 0
+        self._observe()
+        return self.observations
+
+    def step(self, actions):
+
+        # actions[i] is the held arrow keys of env i, packed like a recorded tick (see
+        # Controller.INPUT_KEYS); an env that finishes is restarted straight away and its
+        # row already holds the first observation of the next episode
+        self.episode_steps += 1
+        for index, level in enumerate(self.levels):
+            resets = level.reset_count
+            level.controller.set_input_bits(int(actions[index]))
+            level.update()
+
+            completed = level.is_completed
+            self.rewards[index] = float(completed) - (level.reset_count - resets)
+            self.terminated[index] = completed
+            self.truncated[index] = not completed and self.episode_steps[index] >= self.max_steps
+            if completed or self.truncated[index]:
+                level.restart()
+                self.episode_steps[index] = 0
+
+        self._observe()
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def _observe(self):
+
+        ball = self.observations["ball"]
+        guards = self.observations["guards"]
+        patch = self.observations["patch"]
+        size = 2 * self.patch_radius + 1
+
+        for index, level in enumerate(self.levels):
+            body = level.ball.box2d_body
+            position = body.position
+            velocity = body.linearVelocity
+            ball[index] = (position.x * level.world.PPM, position.y * level.world.PPM,
+                           velocity.x * level.world.PPM, velocity.y * level.world.PPM)
+
+            if level.guards:
+                guards[index, :len(level.guards)] = level.guard_swarm.positions
+
+            # the padded grid is offset by patch_radius, so the ball's cell starts the window
+            cell_x = int(position.x * level.world.PPM // self.scale)
+            cell_y = int(position.y * level.world.PPM // self.scale)
+            grid = self.padded_grids[index]
+            cell_x = min(max(cell_x, 0), grid.shape[0] - size)
+            cell_y = min(max(cell_y, 0), grid.shape[1] - size)
+            patch[index] = grid[cell_x:cell_x + size, cell_y:cell_y + size]